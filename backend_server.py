@@ -3,19 +3,28 @@
 Python backend server for PDF conversion and API endpoints.
 """
 
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 import json
+import re
 import urllib.parse
 import os
 import tempfile
-import uuid
+import secrets
 import threading
 import shutil
+import atexit
+import time
+import sys
+import queue
+import logging
+import logging.handlers
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
-from urllib.parse import parse_qs
-import cgi
-import io
-from pdf_to_word_converter import convert_pdf_file
+from email.message import Message
+from python_multipart.multipart import MultipartParser, MultipartParseError
+from pdf_to_word_converter import PDFToWordConverter
 from pdf_to_powerpoint_converter import PDFToPowerPointConverter
 from pdf_to_excel_converter import PDFToExcelConverter
 from pdf_to_jpg_converter import PDFToJPGConverter
@@ -24,37 +33,378 @@ from powerpoint_to_pdf_converter import PowerPointToPDFConverter # Import PowerP
 from excel_to_pdf_converter import ExcelToPDFConverter # Import Excel to PDF converter
 from html_to_pdf_converter import HTMLToPDFConverter # Import HTML to PDF converter
 
-# Global storage for conversion results
-conversion_storage = {}
-temp_dir = tempfile.mkdtemp()
+# orjson encodes straight to bytes and is several times faster than the
+# stdlib encoder; fall back to json when it isn't installed
+try:
+    import orjson
+
+    def _json_bytes(data):
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+except ImportError:
+    def _json_bytes(data):
+        return json.dumps(data).encode()
 
-# Initialize converters
+# Global storage for conversion results. Finished conversions are dropped,
+# along with their job directory, CONVERSION_TTL seconds after they were started
+conversion_storage = {}
+CONVERSION_TTL = int(os.environ.get('CONVERSION_TTL', 3600))
+# How often the background reaper expires conversions and sweeps temp_dir
+REAPER_INTERVAL = 60
+# Uploads, page renders and converted files can be kept on tmpfs so image-heavy
+# conversions don't wait on disk writes. That is opt-in (USE_SHM_TEMP_DIR=1):
+# tmpfs counts against RAM and Docker's default /dev/shm is only 64 MB, so it is
+# also skipped when it has less than SHM_MIN_FREE_MB free
+shm_dir = '/dev/shm'
+USE_SHM_TEMP_DIR = os.environ.get('USE_SHM_TEMP_DIR') == '1'
+SHM_MIN_FREE_MB = int(os.environ.get('SHM_MIN_FREE_MB', 1024))
+
+def _shm_temp_parent():
+    """Return shm_dir if temp_dir should go there, otherwise None (the system default)"""
+    if not USE_SHM_TEMP_DIR or not os.access(shm_dir, os.W_OK):
+        return None
+    try:
+        stats = os.statvfs(shm_dir)
+    except OSError:
+        return None
+    if stats.f_bavail * stats.f_frsize < SHM_MIN_FREE_MB * 1024 * 1024:
+        print(f"Warning: {shm_dir} has less than {SHM_MIN_FREE_MB} MB free, using the default temp directory")
+        return None
+    return shm_dir
+
+if __name__ == '__mp_main__':
+    # Conversion worker processes import this module under this name; the
+    # converters they are sent already carry the server's temp_dir
+    temp_dir = tempfile.gettempdir()
+else:
+    temp_dir = tempfile.mkdtemp(dir=_shm_temp_parent())
+    # Uploads and converted files all live under temp_dir; remove it when the process exits
+    atexit.register(shutil.rmtree, temp_dir, ignore_errors=True)
+
+# Conversions run on a fixed pool of threads instead of one new thread per request.
+# At most PDF_QUEUE_CAPACITY conversions may be running or waiting; requests beyond
+# that get a 503 with Retry-After rather than piling up. The default runs one
+# conversion per two cores, leaving each one a second core for its page workers
+PDF_MAX_CONCURRENCY = int(os.environ.get('PDF_MAX_CONCURRENCY', max(1, (os.cpu_count() or 1) // 2)))
+PDF_QUEUE_CAPACITY = int(os.environ.get('PDF_QUEUE_CAPACITY', 50))
+conversion_executor = ThreadPoolExecutor(max_workers=PDF_MAX_CONCURRENCY, thread_name_prefix='conversion')
+conversion_slots = threading.BoundedSemaphore(PDF_QUEUE_CAPACITY)
+# Converters that spend their time in pure-Python libraries (pdf2docx, camelot,
+# python-pptx, python-docx, ReportLab, WeasyPrint) hold the GIL, so the pool
+# threads hand them to worker processes and wait. PDF to JPG renders in
+# MuPDF/Pillow with the GIL released, so it stays on the threads.
+# Workers come from a forkserver (spawn where there is none) rather than a fork
+# of this multithreaded server. Each worker imports this module, so nothing at
+# module level may start a thread
+process_context = multiprocessing.get_context(
+    'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+)
+conversion_processes = ProcessPoolExecutor(max_workers=PDF_MAX_CONCURRENCY, mp_context=process_context)
+conversion_processes_lock = threading.Lock()
+# PDF to Word and PDF to Excel split long documents across their own page
+# processes; by default the CPUs are shared between the conversions that can
+# run at once (two page workers each on a multi-core host)
+PDF_PAGE_WORKERS = int(os.environ.get('PDF_PAGE_WORKERS', max(1, (os.cpu_count() or 1) // PDF_MAX_CONCURRENCY)))
+
+def _replace_process_pool(broken_pool):
+    """Swap in a new conversion_processes if broken_pool is still the current one"""
+    global conversion_processes
+    with conversion_processes_lock:
+        if conversion_processes is broken_pool:
+            conversion_processes = ProcessPoolExecutor(max_workers=PDF_MAX_CONCURRENCY, mp_context=process_context)
+            broken_pool.shutdown(wait=False, cancel_futures=True)
+        return conversion_processes
+
+def _run_in_process(fn, *args, **kwargs):
+    """Run fn in conversion_processes and wait for its result. A worker that dies
+    (a crash in LibreOffice or WeasyPrint) breaks the pool for good, so it is
+    replaced before the error reaches the caller"""
+    pool = conversion_processes
+    try:
+        future = pool.submit(fn, *args, **kwargs)
+    except BrokenProcessPool:
+        # An earlier conversion took the pool down and this one never started
+        pool = _replace_process_pool(pool)
+        future = pool.submit(fn, *args, **kwargs)
+    try:
+        return future.result()
+    except BrokenProcessPool:
+        _replace_process_pool(pool)
+        raise
+
+# Request logs are queued and written to stdout by a listener thread, so a
+# request thread never blocks on a slow terminal or pipe
+log_queue = queue.SimpleQueue()
+request_logger = logging.getLogger('backend_server')
+request_logger.setLevel(logging.INFO)
+request_logger.propagate = False
+request_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+log_handler = logging.StreamHandler(sys.stdout)
+log_handler.setFormatter(logging.Formatter('[%(asctime)s] %(message)s', '%Y-%m-%d %H:%M:%S'))
+log_listener = logging.handlers.QueueListener(log_queue, log_handler)
+
+# Initialize converters once; each request reuses the same instance
+word_converter = PDFToWordConverter(temp_dir, page_workers=PDF_PAGE_WORKERS)
 powerpoint_converter = PDFToPowerPointConverter(temp_dir)
-excel_converter = PDFToExcelConverter(temp_dir)
+excel_converter = PDFToExcelConverter(temp_dir, page_workers=PDF_PAGE_WORKERS)
 jpg_converter = PDFToJPGConverter(temp_dir)
 word_to_pdf_converter = WordToPDFConverter(temp_dir) # Initialize the new converter
 powerpoint_to_pdf_converter = PowerPointToPDFConverter(temp_dir) # Initialize PowerPoint to PDF converter
 excel_to_pdf_converter = ExcelToPDFConverter(temp_dir) # Initialize Excel to PDF converter
 html_to_pdf_converter = HTMLToPDFConverter(temp_dir) # Initialize HTML to PDF converter
 
+# Uploads are copied from the socket to disk this many bytes at a time, so a
+# request never holds more than one chunk of the file in memory
+UPLOAD_CHUNK_SIZE = 64 * 1024
+# Largest plain form field kept in memory
+MAX_FORM_FIELD_SIZE = 64 * 1024
+BOUNDARY_RE = re.compile(r'\bboundary="?([^";]+)"?')
+
+def _disposition_params(raw_header):
+    """Return (name, filename) from a part's Content-Disposition header.
+
+    filename is None for plain form fields. The header arrives as raw bytes;
+    browsers send non-ASCII filenames as UTF-8 there, while RFC 2231
+    filename*= values are decoded by the email package.
+    """
+    disposition = Message()
+    disposition['content-disposition'] = raw_header.decode('latin-1')
+    name = disposition.get_param('name', header='content-disposition')
+    filename = disposition.get_filename()
+    if filename is not None and 'filename*' not in disposition['content-disposition']:
+        try: filename = filename.encode('latin-1').decode('utf-8')
+        except UnicodeError: pass
+    return name, filename
+
+def _receive_multipart(rfile, content_length, boundary, upload_dir, file_prefix):
+    """Parse a multipart/form-data body as it is read from the socket.
+
+    The first file part is written to upload_dir/<file_prefix>_<filename> as
+    it arrives. Converters name their output after the upload and write it
+    to the shared temp_dir, so the prefix keeps same-named uploads apart.
+    Other fields are collected as strings. Returns a dict with 'filename',
+    'path' and 'fields', or None if no complete, non-empty file was uploaded.
+    """
+    fields = {}
+    upload = None
+    complete = False
+    part = {}
+
+    def on_part_begin():
+        part.clear()
+        part.update({'headers': {}, 'field': b'', 'value': b'', 'out': None, 'data': None})
+
+    def on_header_field(data, start, end):
+        part['field'] += data[start:end]
+
+    def on_header_value(data, start, end):
+        part['value'] += data[start:end]
+
+    def on_header_end():
+        part['headers'][part['field'].lower()] = part['value']
+        part['field'] = part['value'] = b''
+
+    def on_headers_finished():
+        nonlocal upload
+        name, filename = _disposition_params(part['headers'].get(b'content-disposition', b''))
+        if filename is None:
+            part['name'] = name
+            part['data'] = bytearray()
+            return
+        # Only the first file is kept, and only its base name, so a crafted
+        # filename can't leave upload_dir
+        filename = os.path.basename(filename.replace('\\', '/'))
+        if upload is None and filename not in ('', '.', '..'):
+            path = os.path.join(upload_dir, f"{file_prefix}_{filename}")
+            part['out'] = open(path, 'wb')
+            upload = {'filename': filename, 'path': path, 'fields': fields}
+
+    def on_part_data(data, start, end):
+        if part['out'] is not None:
+            part['out'].write(data[start:end])
+        elif part['data'] is not None and len(part['data']) <= MAX_FORM_FIELD_SIZE:
+            part['data'] += data[start:end]
+
+    def on_part_end():
+        if part['out'] is not None:
+            part['out'].close()
+        elif part['data'] is not None and part['name'] and len(part['data']) <= MAX_FORM_FIELD_SIZE:
+            fields[part['name']] = part['data'].decode('utf-8', 'replace').strip()
+
+    def on_end():
+        nonlocal complete
+        complete = True
+
+    parser = MultipartParser(boundary, {
+        'on_part_begin': on_part_begin, 'on_header_field': on_header_field,
+        'on_header_value': on_header_value, 'on_header_end': on_header_end,
+        'on_headers_finished': on_headers_finished, 'on_part_data': on_part_data,
+        'on_part_end': on_part_end, 'on_end': on_end
+    })
+
+    try:
+        remaining = content_length
+        while remaining > 0:
+            chunk = rfile.read(min(UPLOAD_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            parser.write(chunk)
+        parser.finalize()
+    except MultipartParseError as e:
+        print(f"Malformed multipart upload: {e}")
+        complete = False
+    finally:
+        if part.get('out') is not None:
+            part['out'].close()
+
+    if upload is not None and (not complete or os.path.getsize(upload['path']) == 0):
+        # Truncated request or empty file
+        os.remove(upload['path'])
+        return None
+    return upload
+
+# Downloads at least this large are sent with sendfile; smaller ones are
+# cheaper to copy through the response buffer with the headers
+SENDFILE_MIN_SIZE = 64 * 1024
+
+# Bodies of the error responses whose message never changes, encoded once
+STATIC_ERROR_BODIES = {
+    message: _json_bytes({'error': message})
+    for message in (
+        'Endpoint not found',
+        'Conversion not found',
+        'File not found or has expired',
+        'Content-Type must be multipart/form-data',
+        'Content-Type has no multipart boundary',
+        'No file uploaded',
+        'No data provided',
+        'No valid PDF file found in request',
+        'No valid Word file found in request',
+        'No valid PowerPoint file found in request',
+        'No valid Excel file found in request',
+        'No valid HTML file found in request',
+        'Server is busy, please retry shortly',
+    )
+}
+
+# The health response only changes through its timestamp, so the encoded body
+# is rebuilt at most once per HEALTH_CACHE_SECONDS however often it is probed
+HEALTH_CACHE_SECONDS = 0.1
+_health_cache = (0.0, b'')
+
+def _health_body():
+    """Return the encoded /api/health response, refreshing it when stale"""
+    global _health_cache
+    now = time.monotonic()
+    if now - _health_cache[0] > HEALTH_CACHE_SECONDS:
+        _health_cache = (now, _json_bytes({
+            'status': 'healthy',
+            'service': 'python-backend',
+            'timestamp': datetime.now().isoformat(),
+            'version': '2.0.0',
+            'features': ['pdf-to-word-conversion', 'pdf-to-powerpoint-conversion', 'pdf-to-excel-conversion', 'pdf-to-jpg-conversion', 'word-to-pdf-conversion', 'powerpoint-to-pdf-conversion', 'excel-to-pdf-conversion', 'html-to-pdf-conversion', 'advanced-formatting', 'image-preservation']
+        }))
+    return _health_cache[1]
+
+def _expire_conversions():
+    """Drop finished conversions past their TTL and delete their job directories"""
+    now = time.monotonic()
+    for conversion_id, result in list(conversion_storage.items()):
+        # expires_at is only set once the conversion has finished
+        if 'expires_at' not in result or result['expires_at'] > now:
+            continue
+        conversion_storage.pop(conversion_id, None)
+        shutil.rmtree(os.path.join(temp_dir, conversion_id), ignore_errors=True)
+
+def _reap_temp_dir():
+    """Background loop: expire old conversions and remove anything else in
+    temp_dir (e.g. converter output left behind by a failed job) that is
+    older than CONVERSION_TTL and not owned by a known conversion"""
+    while True:
+        time.sleep(REAPER_INTERVAL)
+        try:
+            _expire_conversions()
+            cutoff = time.time() - CONVERSION_TTL
+            with os.scandir(temp_dir) as entries:
+                for entry in entries:
+                    if entry.name in conversion_storage or entry.stat(follow_symlinks=False).st_mtime > cutoff:
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        shutil.rmtree(entry.path, ignore_errors=True)
+                    else:
+                        os.remove(entry.path)
+        except Exception as e:
+            print(f"Temp directory cleanup failed: {e}")
+
+def _pdf_to_word_options(fields):
+    """Read the PDF to Word form fields; forceRefresh=true re-converts without cached results"""
+    return {'force_refresh': fields.get('forceRefresh', '').lower() in ('1', 'true')}
+
+def _pdf_to_jpg_options(fields):
+    """Read the PDF to JPG form fields, falling back to the defaults"""
+    quality = fields.get('quality', '')
+    dpi = fields.get('dpi', '')
+    return {
+        'output_format': fields.get('format', 'jpg'),
+        'quality': int(quality) if quality.isdigit() else 95,
+        'dpi': int(dpi) if dpi.isdigit() else 300,
+        'page_range': fields.get('pageRange', 'all')
+    }
+
+# Upload endpoints and how each one converts its file. 'extension' is the
+# output file type (None: taken from the 'output_format' option), 'options'
+# turns the extra form fields into converter keyword arguments, and
+# 'in_process' sends the converter to conversion_processes
+UPLOAD_CONVERSIONS = {
+    '/api/convert/pdf-to-word': {
+        'method': 'pdf-to-word', 'label': 'PDF to Word', 'file_type': 'PDF',
+        'convert': word_converter.convert_pdf_to_word, 'extension': 'docx',
+        'options': _pdf_to_word_options, 'in_process': True
+    },
+    '/api/convert/pdf-to-powerpoint': {
+        'method': 'pdf-to-powerpoint', 'label': 'PDF to PowerPoint', 'file_type': 'PDF',
+        'convert': powerpoint_converter.convert_pdf_to_powerpoint, 'extension': 'pptx',
+        'options': None, 'in_process': True
+    },
+    '/api/convert/pdf-to-excel': {
+        'method': 'pdf-to-excel', 'label': 'PDF to Excel', 'file_type': 'PDF',
+        'convert': excel_converter.convert_pdf_to_excel, 'extension': 'xlsx',
+        'options': None, 'in_process': True
+    },
+    '/api/convert/pdf-to-jpg': {
+        'method': 'pdf-to-jpg', 'label': 'PDF to JPG', 'file_type': 'PDF',
+        'convert': jpg_converter.convert_pdf_to_jpg, 'extension': None,
+        'options': _pdf_to_jpg_options, 'in_process': False
+    },
+    '/api/convert/word-to-pdf': {
+        'method': 'word-to-pdf', 'label': 'Word to PDF', 'file_type': 'Word',
+        'convert': word_to_pdf_converter.convert_word_to_pdf, 'extension': 'pdf',
+        'options': None, 'in_process': True
+    },
+    '/api/convert/powerpoint-to-pdf': {
+        'method': 'powerpoint-to-pdf', 'label': 'PowerPoint to PDF', 'file_type': 'PowerPoint',
+        'convert': powerpoint_to_pdf_converter.convert_powerpoint_to_pdf, 'extension': 'pdf',
+        'options': None, 'in_process': True
+    },
+    '/api/convert/excel-to-pdf': {
+        'method': 'excel-to-pdf', 'label': 'Excel to PDF', 'file_type': 'Excel',
+        'convert': excel_to_pdf_converter.convert_excel_to_pdf, 'extension': 'pdf',
+        'options': None, 'in_process': True
+    }
+}
+
 class APIHandler(BaseHTTPRequestHandler):
+    # Buffer wfile so the status line, headers and body of a response leave in
+    # one send when the handler finishes instead of one write per piece, and
+    # don't let Nagle hold back the last segment
+    wbufsize = -1
+    disable_nagle_algorithm = True
+
     def do_GET(self):
         parsed_path = urllib.parse.urlparse(self.path)
 
         if parsed_path.path == '/api/health':
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-
-            response = {
-                'status': 'healthy',
-                'service': 'python-backend',
-                'timestamp': datetime.now().isoformat(),
-                'version': '2.0.0',
-                'features': ['pdf-to-word-conversion', 'pdf-to-powerpoint-conversion', 'pdf-to-excel-conversion', 'pdf-to-jpg-conversion', 'word-to-pdf-conversion', 'powerpoint-to-pdf-conversion', 'excel-to-pdf-conversion', 'html-to-pdf-conversion', 'advanced-formatting', 'image-preservation']
-            }
-            self.wfile.write(json.dumps(response).encode())
+            self._send_json_body(_health_body())
 
         elif parsed_path.path.startswith('/api/status/'):
             # Check conversion status
@@ -68,34 +418,23 @@ class APIHandler(BaseHTTPRequestHandler):
                     result = conversion_storage[conversion_id]
                     print(f"Found conversion result: {result}")
 
-                    self.send_response(200)
-                    self.send_header('Content-type', 'application/json')
-                    self.send_header('Access-Control-Allow-Origin', '*')
-                    self.end_headers()
-
                     status_response = {
                         'conversion_id': conversion_id,
                         'success': result.get('success', False),
                         'status': result.get('status', 'completed' if result.get('success') else ('failed' if 'error' in result else 'processing')),
                         'filename': result.get('filename'),
-                        'download_url': f'/api/download/{conversion_id}/{result.get("filename", "")}' if result.get('success') and result.get('filename') else None,
+                        'download_url': f'/api/download/{conversion_id}/{urllib.parse.quote(result["filename"])}' if result.get('success') and result.get('filename') else None,
                         'error': result.get('error'),
                         'metadata': result.get('metadata', {}),
                         'method': result.get('method')
                     }
-                    self.wfile.write(json.dumps(status_response).encode())
+                    self._send_json_response(status_response)
                     return
 
             # Conversion not found (set default value if not in path)
             conversion_id = path_parts[3] if len(path_parts) >= 4 else 'unknown'
             print(f"Conversion {conversion_id} not found in storage")
-            self.send_response(404)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-
-            response = {'error': 'Conversion not found'}
-            self.wfile.write(json.dumps(response).encode())
+            self._send_error_response(404, 'Conversion not found')
 
         elif parsed_path.path.startswith('/api/download/'):
             # Extract download ID and filename from path
@@ -123,28 +462,15 @@ class APIHandler(BaseHTTPRequestHandler):
                     print(f"Download ID {download_id} not found in storage")
 
             # File not found
-            self.send_response(404)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-
-            response = {'error': 'File not found or has expired'}
-            self.wfile.write(json.dumps(response).encode())
+            self._send_error_response(404, 'File not found or has expired')
 
         else:
-            self.send_response(404)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-
-            response = {'error': 'Endpoint not found'}
-            self.wfile.write(json.dumps(response).encode())
+            self._send_error_response(404, 'Endpoint not found')
 
     def serve_file(self, file_path, filename):
         """Serve a file for download"""
         try:
-            with open(file_path, 'rb') as f:
-                content = f.read()
+            file_size = os.path.getsize(file_path)
 
             # Determine content type based on file extension
             if filename.endswith('.pptx'):
@@ -166,21 +492,26 @@ class APIHandler(BaseHTTPRequestHandler):
 
             self.send_response(200)
             self.send_header('Content-Type', content_type)
-            self.send_header('Content-Disposition', f'attachment; filename="{filename}"')
-            self.send_header('Content-Length', str(len(content)))
+            # Plain ASCII name for old clients, the exact UTF-8 name in filename*
+            ascii_name = filename.encode('ascii', 'replace').decode().replace('"', "'")
+            self.send_header('Content-Disposition', f"attachment; filename=\"{ascii_name}\"; filename*=UTF-8''{urllib.parse.quote(filename)}")
+            self.send_header('Content-Length', str(file_size))
             self.send_header('Access-Control-Allow-Origin', '*')
             self.end_headers()
 
-            self.wfile.write(content)
+            with open(file_path, 'rb') as f:
+                if file_size < SENDFILE_MIN_SIZE:
+                    # Small files ride along with the buffered headers in one send
+                    self.wfile.write(f.read())
+                else:
+                    # Let the kernel copy the file to the socket (sendfile) rather than
+                    # reading it into memory first. The headers are still sitting in
+                    # wfile's buffer, so push them out ahead of the file
+                    self.wfile.flush()
+                    self.connection.sendfile(f)
 
         except Exception as e:
-            self.send_response(500)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-
-            response = {'error': f'Failed to serve file: {str(e)}'}
-            self.wfile.write(json.dumps(response).encode())
+            self._send_error_response(500, f'Failed to serve file: {str(e)}')
 
     def do_OPTIONS(self):
         # Handle CORS preflight requests
@@ -192,833 +523,178 @@ class APIHandler(BaseHTTPRequestHandler):
 
     def _send_json_response(self, data, status_code=200):
         """Helper to send JSON responses"""
+        self._send_json_body(_json_bytes(data), status_code)
+
+    def _send_json_body(self, body, status_code=200):
+        """Helper to send an already encoded JSON body"""
         try:
             self.send_response(status_code)
             self.send_header('Content-type', 'application/json')
             self.send_header('Access-Control-Allow-Origin', '*')
+            self.send_header('Content-Length', str(len(body)))
             self.end_headers()
-            self.wfile.write(json.dumps(data).encode())
+            self.wfile.write(body)
         except (BrokenPipeError, ConnectionResetError):
             # Client disconnected, ignore the error
             pass
 
     def _send_error_response(self, status_code, message):
         """Helper to send error responses"""
-        self._send_json_response({'error': message}, status_code)
+        body = STATIC_ERROR_BODIES.get(message)
+        if body is None:
+            body = _json_bytes({'error': message})
+        self._send_json_body(body, status_code)
+
+    def _parse_multipart_meta(self):
+        """Return (boundary, content_length) for a multipart upload, or send a 400 and return None"""
+        content_type = self.headers.get('Content-Type', '')
+        if not content_type.startswith('multipart/form-data'):
+            self._send_error_response(400, 'Content-Type must be multipart/form-data')
+            return None
+
+        content_length = int(self.headers.get('Content-Length', 0))
+        if content_length == 0:
+            self._send_error_response(400, 'No file uploaded')
+            return None
+
+        boundary_match = BOUNDARY_RE.search(content_type)
+        if not boundary_match:
+            self._send_error_response(400, 'Content-Type has no multipart boundary')
+            return None
+
+        return boundary_match.group(1).encode(), content_length
+
+    def _submit_conversion(self, conversion_id, convert_async):
+        """Queue a conversion on the shared executor, or answer 503 if the queue is full"""
+        if not conversion_slots.acquire(blocking=False):
+            conversion_storage.pop(conversion_id, None)
+            shutil.rmtree(os.path.join(temp_dir, conversion_id), ignore_errors=True)
+            try:
+                self.send_response(503)
+                self.send_header('Content-type', 'application/json')
+                self.send_header('Access-Control-Allow-Origin', '*')
+                self.send_header('Retry-After', '5')
+                self.send_header('Content-Length', str(len(STATIC_ERROR_BODIES['Server is busy, please retry shortly'])))
+                self.end_headers()
+                self.wfile.write(STATIC_ERROR_BODIES['Server is busy, please retry shortly'])
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+            return False
+
+        def run_conversion():
+            try:
+                convert_async()
+            finally:
+                # The TTL counts from completion, so a conversion that took a
+                # long time is still kept for CONVERSION_TTL after it finishes
+                result = conversion_storage.get(conversion_id)
+                if result is not None:
+                    result['expires_at'] = time.monotonic() + CONVERSION_TTL
+
+        future = conversion_executor.submit(run_conversion)
+        future.add_done_callback(lambda _: conversion_slots.release())
+        return True
 
     def do_POST(self):
         try:
-            if self.path == '/api/convert/pdf-to-word':
-                self.handle_pdf_to_word_conversion()
-            elif self.path == '/api/convert/pdf-to-powerpoint':
-                self.handle_pdf_to_powerpoint_conversion()
-            elif self.path == '/api/convert/pdf-to-excel':
-                self.handle_pdf_to_excel_conversion()
-            elif self.path == '/api/convert/pdf-to-jpg':
-                self.handle_pdf_to_jpg_conversion()
-            elif self.path == '/api/convert/word-to-pdf': # Added handler for Word to PDF
-                self.handle_word_to_pdf_conversion()
-            elif self.path == '/api/convert/powerpoint-to-pdf': # Added handler for PowerPoint to PDF
-                self.handle_powerpoint_to_pdf_conversion()
-            elif self.path == '/api/convert/excel-to-pdf': # Added handler for Excel to PDF
-                self.handle_excel_to_pdf_conversion()
+            spec = UPLOAD_CONVERSIONS.get(self.path)
+            if spec:
+                self.handle_upload_conversion(spec)
             elif self.path == '/api/convert/html-to-pdf': # Added handler for HTML to PDF
                 self.handle_html_to_pdf_conversion()
             else:
                 # Handle other POST requests
-                self.send_response(404)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-
-                response = {'error': 'Endpoint not found'}
-                self.wfile.write(json.dumps(response).encode())
+                self._send_error_response(404, 'Endpoint not found')
 
         except Exception as e:
             self.log_message(f"Error in POST request: {str(e)}")
-            self.send_response(500)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-
-            response = {'error': f'Internal server error: {str(e)}'}
-            self.wfile.write(json.dumps(response).encode())
-
-    def handle_pdf_to_word_conversion(self):
-        """Handle PDF to Word conversion requests"""
-        try:
-            # Parse multipart form data
-            content_type = self.headers.get('Content-Type', '')
-            if not content_type.startswith('multipart/form-data'):
-                self._send_error_response(400, 'Content-Type must be multipart/form-data')
-                return
-
-            content_length = int(self.headers.get('Content-Length', 0))
-            if content_length == 0:
-                self._send_error_response(400, 'No file uploaded')
-                return
-
-            # Read and parse multipart data
-            body = self.rfile.read(content_length)
-            boundary = content_type.split('boundary=')[1].encode()
-            parts = body.split(b'--' + boundary)
-
-            pdf_file_content = None
-            pdf_filename = None
-
-            for part in parts:
-                if b'Content-Disposition' in part and b'filename=' in part:
-                    lines = part.split(b'\r\n')
-                    for line in lines:
-                        if b'Content-Disposition' in line:
-                            if b'filename=' in line:
-                                filename_part = line.split(b'filename=')[1]
-                                pdf_filename = filename_part.strip(b'"').decode('utf-8')
-                                break
-                    if b'\r\n\r\n' in part:
-                        pdf_file_content = part.split(b'\r\n\r\n', 1)[1]
-                        if pdf_file_content.endswith(b'\r\n'):
-                            pdf_file_content = pdf_file_content[:-2]
-                        break
-
-            if not pdf_file_content or not pdf_filename:
-                self._send_error_response(400, 'No valid PDF file found in request')
-                return
-
-            conversion_id = str(uuid.uuid4())
-            pdf_temp_path = os.path.join(temp_dir, f"{conversion_id}_{pdf_filename}")
-            with open(pdf_temp_path, 'wb') as f:
-                f.write(pdf_file_content)
-
-            conversion_storage[conversion_id] = {
-                'conversion_id': conversion_id, 'success': False, 'status': 'processing',
-                'filename': None, 'download_url': None, 'error': None, 'metadata': {},
-                'method': 'pdf-to-word'
-            }
-
-            def convert_async():
-                try:
-                    result = convert_pdf_file(pdf_temp_path, temp_dir)
-                    if result['success']:
-                        base_name = os.path.splitext(pdf_filename)[0]
-                        output_filename = f"{conversion_id}_{base_name}_converted.docx"
-                        final_output_path = os.path.join(temp_dir, output_filename)
-                        if os.path.exists(result['output_path']):
-                            shutil.move(result['output_path'], final_output_path)
-                            result['output_path'] = final_output_path
-                            result['filename'] = output_filename
-                        else:
-                            result['filename'] = os.path.basename(result.get('output_path', 'unknown_output.docx'))
-                    result['conversion_id'] = conversion_id
-                    conversion_storage[conversion_id].update({
-                        'success': True, 'status': 'completed', 'filename': result.get('filename'),
-                        'download_url': f'/api/download/{conversion_id}/{result.get("filename", "")}' if result.get('success') and result.get('filename') else None,
-                        'error': None, 'metadata': result.get('metadata', {}), 'method': result.get('method', 'pdf-to-word')
-                    })
-                    print(f"Updated result for {conversion_id} in conversion_storage")
-                    try: os.remove(pdf_temp_path)
-                    except: pass
-                except Exception as e:
-                    print(f"Async conversion error for {conversion_id}: {e}")
-                    if conversion_id in conversion_storage:
-                        conversion_storage[conversion_id].update({
-                            'success': False, 'status': 'failed', 'filename': None,
-                            'download_url': None, 'error': f'Conversion failed: {str(e)}',
-                            'metadata': {}, 'method': 'pdf-to-word'
-                        })
-                    else:
-                        conversion_storage[conversion_id] = {
-                            'conversion_id': conversion_id, 'success': False, 'status': 'failed',
-                            'filename': None, 'download_url': None, 'error': f'Conversion failed: {str(e)}',
-                            'metadata': {}, 'method': 'pdf-to-word'
-                        }
-                    print(f"Updated error result for {conversion_id} in conversion_storage")
-
-            thread = threading.Thread(target=convert_async)
-            thread.daemon = True
-            thread.start()
-
-            self._send_json_response({
-                'success': True, 'conversion_id': conversion_id, 'status': 'processing',
-                'message': 'PDF to Word conversion started. Use the conversion ID to check status.'
-            }, 202)
-
-        except Exception as e:
-            self.log_message(f"Error in PDF to Word conversion: {str(e)}")
             self._send_error_response(500, f'Internal server error: {str(e)}')
 
-    def handle_pdf_to_powerpoint_conversion(self):
-        """Handle PDF to PowerPoint conversion requests"""
-        try:
-            content_type = self.headers.get('Content-Type', '')
-            if not content_type.startswith('multipart/form-data'):
-                self._send_error_response(400, 'Content-Type must be multipart/form-data')
-                return
-
-            content_length = int(self.headers.get('Content-Length', 0))
-            if content_length == 0:
-                self._send_error_response(400, 'No file uploaded')
-                return
-
-            body = self.rfile.read(content_length)
-            boundary = content_type.split('boundary=')[1].encode()
-            parts = body.split(b'--' + boundary)
-
-            pdf_file_content = None
-            pdf_filename = None
-
-            for part in parts:
-                if b'Content-Disposition' in part and b'filename=' in part:
-                    lines = part.split(b'\r\n')
-                    for line in lines:
-                        if b'Content-Disposition' in line:
-                            if b'filename=' in line:
-                                filename_part = line.split(b'filename=')[1]
-                                pdf_filename = filename_part.strip(b'"').decode('utf-8')
-                                break
-                    if b'\r\n\r\n' in part:
-                        pdf_file_content = part.split(b'\r\n\r\n', 1)[1]
-                        if pdf_file_content.endswith(b'\r\n'):
-                            pdf_file_content = pdf_file_content[:-2]
-                        break
-
-            if not pdf_file_content or not pdf_filename:
-                self._send_error_response(400, 'No valid PDF file found in request')
-                return
-
-            conversion_id = str(uuid.uuid4())
-            pdf_temp_path = os.path.join(temp_dir, f"{conversion_id}_{pdf_filename}")
-            with open(pdf_temp_path, 'wb') as f:
-                f.write(pdf_file_content)
-
-            conversion_storage[conversion_id] = {
-                'conversion_id': conversion_id, 'success': False, 'status': 'processing',
-                'filename': None, 'download_url': None, 'error': None, 'metadata': {},
-                'method': 'pdf-to-powerpoint'
-            }
-
-            def convert_async():
-                try:
-                    result = powerpoint_converter.convert_pdf_to_powerpoint(pdf_temp_path)
-                    if result['success']:
-                        base_name = os.path.splitext(pdf_filename)[0]
-                        output_filename = f"{conversion_id}_{base_name}_converted.pptx"
-                        final_output_path = os.path.join(temp_dir, output_filename)
-                        if os.path.exists(result['output_path']):
-                            shutil.move(result['output_path'], final_output_path)
-                            result['output_path'] = final_output_path
-                            result['filename'] = output_filename
-                        else:
-                            result['filename'] = os.path.basename(result.get('output_path', 'unknown_output.pptx'))
-                    result['conversion_id'] = conversion_id
-                    conversion_storage[conversion_id].update({
-                        'success': True, 'status': 'completed', 'filename': result.get('filename'),
-                        'download_url': f'/api/download/{conversion_id}/{result.get("filename", "")}' if result.get('success') and result.get('filename') else None,
-                        'error': None, 'metadata': result.get('metadata', {}), 'method': result.get('method', 'pdf-to-powerpoint')
-                    })
-                    print(f"Updated result for {conversion_id} in conversion_storage")
-                    try: os.remove(pdf_temp_path)
-                    except: pass
-                except Exception as e:
-                    print(f"Async conversion error for {conversion_id}: {e}")
-                    if conversion_id in conversion_storage:
-                        conversion_storage[conversion_id].update({
-                            'success': False, 'status': 'failed', 'filename': None,
-                            'download_url': None, 'error': f'PowerPoint conversion failed: {str(e)}',
-                            'metadata': {}, 'method': 'pdf-to-powerpoint'
-                        })
-                    else:
-                        conversion_storage[conversion_id] = {
-                            'conversion_id': conversion_id, 'success': False, 'status': 'failed',
-                            'filename': None, 'download_url': None, 'error': f'PowerPoint conversion failed: {str(e)}',
-                            'metadata': {}, 'method': 'pdf-to-powerpoint'
-                        }
-                    print(f"Updated error result for {conversion_id} in conversion_storage")
-
-            thread = threading.Thread(target=convert_async)
-            thread.daemon = True
-            thread.start()
-
-            self._send_json_response({
-                'success': True, 'conversion_id': conversion_id,
-                'message': 'PDF to PowerPoint conversion started',
-                'status_url': f'/api/status/{conversion_id}'
-            }, 202)
-
-        except Exception as e:
-            self.log_message(f"Error in PDF to PowerPoint conversion: {e}")
-            self._send_error_response(500, f'Conversion failed: {str(e)}')
-
-    def handle_pdf_to_excel_conversion(self):
-        """Handle PDF to Excel conversion requests"""
+    def handle_upload_conversion(self, spec):
+        """Handle a file upload conversion request described by an UPLOAD_CONVERSIONS entry"""
         try:
-            content_type = self.headers.get('Content-Type', '')
-            if not content_type.startswith('multipart/form-data'):
-                self._send_error_response(400, 'Content-Type must be multipart/form-data')
-                return
-
-            content_length = int(self.headers.get('Content-Length', 0))
-            if content_length == 0:
-                self._send_error_response(400, 'No file uploaded')
+            multipart = self._parse_multipart_meta()
+            if not multipart:
                 return
-
-            body = self.rfile.read(content_length)
-            boundary = content_type.split('boundary=')[1].encode()
-            parts = body.split(b'--' + boundary)
-
-            pdf_file_content = None
-            pdf_filename = None
-
-            for part in parts:
-                if b'Content-Disposition' in part and b'filename=' in part:
-                    lines = part.split(b'\r\n')
-                    for line in lines:
-                        if b'Content-Disposition' in line:
-                            if b'filename=' in line:
-                                filename_part = line.split(b'filename=')[1]
-                                pdf_filename = filename_part.strip(b'"').decode('utf-8')
-                                break
-                    if b'\r\n\r\n' in part:
-                        pdf_file_content = part.split(b'\r\n\r\n', 1)[1]
-                        if pdf_file_content.endswith(b'\r\n'):
-                            pdf_file_content = pdf_file_content[:-2]
-                        break
-
-            if not pdf_file_content or not pdf_filename:
-                self._send_error_response(400, 'No valid PDF file found in request')
+            boundary, content_length = multipart
+
+            # Stream the upload straight to disk instead of reading the whole body.
+            # Everything a conversion writes lives in its own job directory
+            conversion_id = secrets.token_urlsafe(16)
+            job_dir = os.path.join(temp_dir, conversion_id)
+            os.mkdir(job_dir)
+            upload = _receive_multipart(self.rfile, content_length, boundary, job_dir, conversion_id)
+
+            if not upload:
+                shutil.rmtree(job_dir, ignore_errors=True)
+                self._send_error_response(400, f"No valid {spec['file_type']} file found in request")
                 return
 
-            conversion_id = str(uuid.uuid4())
-            pdf_temp_path = os.path.join(temp_dir, f"{conversion_id}_{pdf_filename}")
-            with open(pdf_temp_path, 'wb') as f:
-                f.write(pdf_file_content)
+            method = spec['method']
+            options = spec['options'](upload['fields']) if spec['options'] else {}
 
             conversion_storage[conversion_id] = {
                 'conversion_id': conversion_id, 'success': False, 'status': 'processing',
                 'filename': None, 'download_url': None, 'error': None, 'metadata': {},
-                'method': 'pdf-to-excel'
+                'method': method
             }
 
             def convert_async():
                 try:
-                    result = excel_converter.convert_pdf_to_excel(pdf_temp_path)
-                    if result['success']:
-                        base_name = os.path.splitext(pdf_filename)[0]
-                        output_filename = f"{conversion_id}_{base_name}_converted.xlsx"
-                        final_output_path = os.path.join(temp_dir, output_filename)
-                        if os.path.exists(result['output_path']):
-                            shutil.move(result['output_path'], final_output_path)
-                            result['output_path'] = final_output_path
-                            result['filename'] = output_filename
-                        else:
-                            result['filename'] = os.path.basename(result.get('output_path', 'unknown_output.xlsx'))
-                    result['conversion_id'] = conversion_id
-                    conversion_storage[conversion_id].update({
-                        'success': True, 'status': 'completed', 'filename': result.get('filename'),
-                        'download_url': f'/api/download/{conversion_id}/{result.get("filename", "")}' if result.get('success') and result.get('filename') else None,
-                        'error': None, 'metadata': result.get('metadata', {}), 'method': result.get('method', 'pdf-to-excel')
-                    })
-                    print(f"Updated result for {conversion_id} in conversion_storage")
-                    try: os.remove(pdf_temp_path)
-                    except: pass
-                except Exception as e:
-                    print(f"Async conversion error for {conversion_id}: {e}")
-                    if conversion_id in conversion_storage:
-                        conversion_storage[conversion_id].update({
-                            'success': False, 'status': 'failed', 'filename': None,
-                            'download_url': None, 'error': f'Excel conversion failed: {str(e)}',
-                            'metadata': {}, 'method': 'pdf-to-excel'
-                        })
+                    print(f"Starting {spec['label']} conversion for {conversion_id}")
+                    if spec['in_process']:
+                        result = _run_in_process(spec['convert'], upload['path'], **options)
                     else:
-                        conversion_storage[conversion_id] = {
-                            'conversion_id': conversion_id, 'success': False, 'status': 'failed',
-                            'filename': None, 'download_url': None, 'error': f'Excel conversion failed: {str(e)}',
-                            'metadata': {}, 'method': 'pdf-to-excel'
-                        }
-                    print(f"Updated error result for {conversion_id} in conversion_storage")
-
-            thread = threading.Thread(target=convert_async)
-            thread.daemon = True
-            thread.start()
-
-            self._send_json_response({
-                'success': True, 'conversion_id': conversion_id,
-                'message': 'PDF to Excel conversion started',
-                'status_url': f'/api/status/{conversion_id}'
-            }, 202)
-
-        except Exception as e:
-            self.log_message(f"Error in PDF to Excel conversion: {e}")
-            self._send_error_response(500, f'Conversion failed: {str(e)}')
-
-    def handle_pdf_to_jpg_conversion(self):
-        """Handle PDF to JPG conversion requests"""
-        try:
-            content_type = self.headers.get('Content-Type', '')
-            if not content_type.startswith('multipart/form-data'):
-                self._send_error_response(400, 'Content-Type must be multipart/form-data')
-                return
-
-            content_length = int(self.headers.get('Content-Length', 0))
-            if content_length == 0:
-                self._send_error_response(400, 'No file uploaded')
-                return
-
-            body = self.rfile.read(content_length)
-            boundary = content_type.split('boundary=')[1].encode()
-            parts = body.split(b'--' + boundary)
-
-            pdf_file_content = None
-            pdf_filename = None
-            conversion_options = {
-                'output_format': 'jpg', 'dpi': 300, 'quality': 95, 'page_range': 'all'
-            }
-
-            for part in parts:
-                if b'Content-Disposition' in part:
-                    lines = part.split(b'\r\n')
-                    for line in lines:
-                        if b'Content-Disposition' in line:
-                            if b'filename=' in line:
-                                filename_part = line.split(b'filename=')[1]
-                                pdf_filename = filename_part.strip(b'"').decode('utf-8')
-                            elif b'name=' in line:
-                                name_part = line.split(b'name=')[1].strip(b'"').decode('utf-8')
-                                if name_part in ['format', 'quality', 'dpi', 'pageRange']:
-                                    value = part.split(b'\r\n\r\n', 1)[1].strip(b'\r\n').decode('utf-8')
-                                    if name_part == 'format': conversion_options['output_format'] = value
-                                    elif name_part == 'quality': conversion_options['quality'] = int(value) if value.isdigit() else 95
-                                    elif name_part == 'dpi': conversion_options['dpi'] = int(value) if value.isdigit() else 300
-                                    elif name_part == 'pageRange': conversion_options['page_range'] = value
-                    if b'filename=' in part and b'\r\n\r\n' in part:
-                        pdf_file_content = part.split(b'\r\n\r\n', 1)[1]
-                        if pdf_file_content.endswith(b'\r\n'):
-                            pdf_file_content = pdf_file_content[:-2]
-
-            if not pdf_file_content or not pdf_filename:
-                self._send_error_response(400, 'No valid PDF file found in request')
-                return
-
-            conversion_id = str(uuid.uuid4())
-            pdf_temp_path = os.path.join(temp_dir, f"{conversion_id}_{pdf_filename}")
-            with open(pdf_temp_path, 'wb') as f:
-                f.write(pdf_file_content)
-
-            conversion_storage[conversion_id] = {
-                'conversion_id': conversion_id, 'success': False, 'status': 'processing',
-                'filename': None, 'download_url': None, 'error': None, 'metadata': {},
-                'method': 'pdf-to-jpg'
-            }
-
-            def convert_async():
-                try:
-                    print(f"Starting background conversion for {conversion_id}")
-                    result = jpg_converter.convert_pdf_to_jpg(
-                        pdf_temp_path,
-                        output_format=conversion_options['output_format'],
-                        dpi=conversion_options['dpi'],
-                        quality=conversion_options['quality'],
-                        page_range=conversion_options['page_range']
-                    )
-                    print(f"Conversion result for {conversion_id}: {result}")
-                    if result['success']:
-                        base_name = os.path.splitext(pdf_filename)[0]
-                        if result.get('pages_converted', 1) == 1:
-                            output_filename = f"{conversion_id}_{base_name}_converted.{conversion_options['output_format']}"
+                        result = spec['convert'](upload['path'], **options)
+                    success = result.get('success', False)
+                    if success:
+                        base_name = os.path.splitext(upload['filename'])[0]
+                        if result['output_path'].endswith('.zip'):
+                            # Multi-page image output comes back as one archive
+                            output_filename = f"{base_name}_converted_pages.zip"
                         else:
-                            output_filename = f"{conversion_id}_{base_name}_converted_pages.zip"
-                        final_output_path = os.path.join(temp_dir, output_filename)
+                            extension = spec['extension'] or options['output_format']
+                            output_filename = f"{base_name}_converted.{extension}"
+                        final_output_path = os.path.join(job_dir, output_filename)
                         if os.path.exists(result['output_path']):
                             shutil.move(result['output_path'], final_output_path)
                             result['output_path'] = final_output_path
                             result['filename'] = output_filename
                         else:
-                            result['filename'] = os.path.basename(result.get('output_path', 'unknown_output.jpg'))
-                    result['conversion_id'] = conversion_id
+                            print(f"Output file {result['output_path']} does not exist")
+                            success = False
+                            result['error'] = f"{spec['label']} conversion produced no output file"
                     conversion_storage[conversion_id].update({
-                        'success': True, 'status': 'completed', 'filename': result.get('filename'),
-                        'download_url': f'/api/download/{conversion_id}/{result.get("filename", "")}' if result.get('success') and result.get('filename') else None,
-                        'error': None, 'metadata': result.get('metadata', {}), 'method': result.get('method', 'pdf-to-jpg')
-                    })
-                    print(f"Stored conversion result for {conversion_id}")
-                    try: os.remove(pdf_temp_path)
-                    except: pass
-                except Exception as e:
-                    print(f"Conversion error for {conversion_id}: {str(e)}")
-                    if conversion_id in conversion_storage:
-                        conversion_storage[conversion_id].update({
-                            'success': False, 'status': 'failed', 'filename': None,
-                            'download_url': None, 'error': f'JPG conversion failed: {str(e)}',
-                            'metadata': {}, 'method': 'pdf-to-jpg'
-                        })
-                    else:
-                        conversion_storage[conversion_id] = {
-                            'conversion_id': conversion_id, 'success': False, 'status': 'failed',
-                            'filename': None, 'download_url': None, 'error': f'JPG conversion failed: {str(e)}',
-                            'metadata': {}, 'method': 'pdf-to-jpg'
-                        }
-                    print(f"Stored conversion result for {conversion_id}")
-
-            thread = threading.Thread(target=convert_async)
-            thread.daemon = True
-            thread.start()
-
-            self._send_json_response({
-                'success': True, 'conversion_id': conversion_id,
-                'message': 'PDF to JPG conversion started',
-                'status_url': f'/api/status/{conversion_id}'
-            }, 202)
-
-        except Exception as e:
-            self.log_message(f"Error in PDF to JPG conversion: {e}")
-            self._send_error_response(500, f'Conversion failed: {str(e)}')
-
-    def handle_word_to_pdf_conversion(self):
-        """Handle Word to PDF conversion requests"""
-        try:
-            content_type = self.headers.get('Content-Type', '')
-            if not content_type.startswith('multipart/form-data'):
-                self._send_error_response(400, 'Content-Type must be multipart/form-data')
-                return
-
-            content_length = int(self.headers.get('Content-Length', 0))
-            if content_length == 0:
-                self._send_error_response(400, 'No file uploaded')
-                return
-
-            body = self.rfile.read(content_length)
-            boundary = content_type.split('boundary=')[1].encode()
-            parts = body.split(b'--' + boundary)
-
-            word_file_content = None
-            word_filename = None
-
-            for part in parts:
-                if b'Content-Disposition' in part and b'filename=' in part:
-                    lines = part.split(b'\r\n')
-                    for line in lines:
-                        if b'Content-Disposition' in line:
-                            if b'filename=' in line:
-                                filename_part = line.split(b'filename=')[1]
-                                word_filename = filename_part.strip(b'"').decode('utf-8')
-                                break
-                    if b'\r\n\r\n' in part:
-                        word_file_content = part.split(b'\r\n\r\n', 1)[1]
-                        if word_file_content.endswith(b'\r\n'):
-                            word_file_content = word_file_content[:-2]
-                        break
-
-            if not word_file_content or not word_filename:
-                self._send_error_response(400, 'No valid Word file found in request')
-                return
-
-            conversion_id = str(uuid.uuid4())
-            word_temp_path = os.path.join(temp_dir, f"{conversion_id}_{word_filename}")
-            with open(word_temp_path, 'wb') as f:
-                f.write(word_file_content)
-
-            conversion_storage[conversion_id] = {
-                'conversion_id': conversion_id, 'success': False, 'status': 'processing',
-                'filename': None, 'download_url': None, 'error': None, 'metadata': {},
-                'method': 'word-to-pdf'
-            }
-
-            def convert_async():
-                try:
-                    print(f"Starting async Word to PDF conversion for {conversion_id}")
-                    result = word_to_pdf_converter.convert_word_to_pdf(word_temp_path)
-                    print(f"Conversion result for {conversion_id}: {result}")
-                    if result.get('success'):
-                        base_name = os.path.splitext(word_filename)[0]
-                        output_filename = f"{conversion_id}_{base_name}_converted.pdf"
-                        final_output_path = os.path.join(temp_dir, output_filename)
-                        try:
-                            if os.path.exists(result['output_path']):
-                                print(f"Moving file from {result['output_path']} to {final_output_path}")
-                                shutil.move(result['output_path'], final_output_path)
-                                result['output_path'] = final_output_path
-                                result['filename'] = output_filename
-                                print(f"File successfully moved to {final_output_path}")
-                            else:
-                                print(f"Warning: Output file {result['output_path']} does not exist")
-                                result['filename'] = os.path.basename(result.get('output_path', 'unknown_output.pdf'))
-                        except Exception as move_error:
-                            print(f"Error moving file: {move_error}")
-                            result['filename'] = os.path.basename(result.get('output_path', 'unknown_output.pdf'))
-                    result['conversion_id'] = conversion_id
-                    conversion_storage[conversion_id].update({
-                        'success': result.get('success', True), 'status': 'completed', 'filename': result.get('filename'),
-                        'output_path': result.get('output_path'),
-                        'download_url': f'/api/download/{conversion_id}/{result.get("filename", "")}' if result.get('success') and result.get('filename') else None,
-                        'error': None, 'metadata': result.get('metadata', {}), 'method': result.get('method', 'word-to-pdf')
+                        'success': success, 'status': 'completed' if success else 'failed',
+                        'filename': result.get('filename'), 'output_path': result.get('output_path'),
+                        'download_url': f'/api/download/{conversion_id}/{urllib.parse.quote(result["filename"])}' if success and result.get('filename') else None,
+                        'error': None if success else result.get('error', f"{spec['label']} conversion failed"),
+                        'metadata': result.get('metadata', {}), 'method': result.get('method', method)
                     })
                     print(f"Stored result for {conversion_id} in conversion_storage")
-                    try:
-                        os.remove(word_temp_path)
-                        print(f"Cleaned up temp file {word_temp_path}")
-                    except:
-                        pass
                 except Exception as e:
-                    print(f"Exception in convert_async for {conversion_id}: {str(e)}")
-                    if conversion_id in conversion_storage:
-                        conversion_storage[conversion_id].update({
-                            'success': False, 'status': 'failed', 'filename': None,
-                            'download_url': None, 'error': f'Word to PDF conversion failed: {str(e)}',
-                            'metadata': {}, 'method': 'word-to-pdf'
-                        })
-                    else:
-                        conversion_storage[conversion_id] = {
-                            'conversion_id': conversion_id, 'success': False, 'status': 'failed',
-                            'filename': None, 'download_url': None, 'error': f'Word to PDF conversion failed: {str(e)}',
-                            'metadata': {}, 'method': 'word-to-pdf'
-                        }
-                    print(f"Stored error result for {conversion_id}")
-                print(f"Async conversion completed for {conversion_id}. Available conversions: {list(conversion_storage.keys())}")
-
-            thread = threading.Thread(target=convert_async)
-            thread.daemon = True
-            thread.start()
-
-            self._send_json_response({
-                'success': True, 'conversion_id': conversion_id,
-                'message': 'Word to PDF conversion started',
-                'status_url': f'/api/status/{conversion_id}'
-            }, 202)
-
-        except Exception as e:
-            self.log_message(f"Error in Word to PDF conversion: {e}")
-            self._send_error_response(500, f'Conversion failed: {str(e)}')
-
-    def handle_powerpoint_to_pdf_conversion(self):
-        """Handle PowerPoint to PDF conversion requests"""
-        try:
-            content_type = self.headers.get('Content-Type', '')
-            if not content_type.startswith('multipart/form-data'):
-                self._send_error_response(400, 'Content-Type must be multipart/form-data')
-                return
-
-            content_length = int(self.headers.get('Content-Length', 0))
-            if content_length == 0:
-                self._send_error_response(400, 'No file uploaded')
-                return
-
-            body = self.rfile.read(content_length)
-            boundary = content_type.split('boundary=')[1].encode()
-            parts = body.split(b'--' + boundary)
-
-            pptx_file_content = None
-            pptx_filename = None
-
-            for part in parts:
-                if b'Content-Disposition' in part and b'filename=' in part:
-                    lines = part.split(b'\r\n')
-                    for line in lines:
-                        if b'Content-Disposition' in line:
-                            if b'filename=' in line:
-                                filename_part = line.split(b'filename=')[1]
-                                pptx_filename = filename_part.strip(b'"').decode('utf-8')
-                                break
-                    if b'\r\n\r\n' in part:
-                        pptx_file_content = part.split(b'\r\n\r\n', 1)[1]
-                        if pptx_file_content.endswith(b'\r\n'):
-                            pptx_file_content = pptx_file_content[:-2]
-                        break
-
-            if not pptx_file_content or not pptx_filename:
-                self._send_error_response(400, 'No valid PowerPoint file found in request')
-                return
-
-            conversion_id = str(uuid.uuid4())
-            pptx_temp_path = os.path.join(temp_dir, f"{conversion_id}_{pptx_filename}")
-            with open(pptx_temp_path, 'wb') as f:
-                f.write(pptx_file_content)
-
-            conversion_storage[conversion_id] = {
-                'conversion_id': conversion_id, 'success': False, 'status': 'processing',
-                'filename': None, 'download_url': None, 'error': None, 'metadata': {},
-                'method': 'powerpoint-to-pdf'
-            }
-
-            def convert_async():
-                try:
-                    print(f"Starting async PowerPoint to PDF conversion for {conversion_id}")
-                    result = powerpoint_to_pdf_converter.convert_powerpoint_to_pdf(pptx_temp_path)
-                    print(f"Conversion result for {conversion_id}: {result}")
-                    if result.get('success'):
-                        base_name = os.path.splitext(pptx_filename)[0]
-                        output_filename = f"{conversion_id}_{base_name}_converted.pdf"
-                        final_output_path = os.path.join(temp_dir, output_filename)
-                        try:
-                            if os.path.exists(result['output_path']):
-                                print(f"Moving file from {result['output_path']} to {final_output_path}")
-                                shutil.move(result['output_path'], final_output_path)
-                                result['output_path'] = final_output_path
-                                result['filename'] = output_filename
-                                print(f"File successfully moved to {final_output_path}")
-                            else:
-                                print(f"Warning: Output file {result['output_path']} does not exist")
-                                result['filename'] = os.path.basename(result.get('output_path', 'unknown_output.pdf'))
-                        except Exception as move_error:
-                            print(f"Error moving file: {move_error}")
-                            result['filename'] = os.path.basename(result.get('output_path', 'unknown_output.pdf'))
-                    result['conversion_id'] = conversion_id
-                    conversion_storage[conversion_id].update({
-                        'success': result.get('success', True), 'status': 'completed', 'filename': result.get('filename'),
-                        'output_path': result.get('output_path'),
-                        'download_url': f'/api/download/{conversion_id}/{result.get("filename", "")}' if result.get('success') and result.get('filename') else None,
-                        'error': None, 'metadata': result.get('metadata', {}), 'method': result.get('method', 'powerpoint-to-pdf')
+                    print(f"Async conversion error for {conversion_id}: {e}")
+                    conversion_storage.setdefault(conversion_id, {'conversion_id': conversion_id}).update({
+                        'success': False, 'status': 'failed', 'filename': None,
+                        'download_url': None, 'error': f"{spec['label']} conversion failed: {str(e)}",
+                        'metadata': {}, 'method': method
                     })
-                    print(f"Stored result for {conversion_id} in conversion_storage")
-                    try:
-                        os.remove(pptx_temp_path)
-                        print(f"Cleaned up temp file {pptx_temp_path}")
-                    except:
-                        pass
-                except Exception as e:
-                    print(f"Exception in convert_async for {conversion_id}: {str(e)}")
-                    if conversion_id in conversion_storage:
-                        conversion_storage[conversion_id].update({
-                            'success': False, 'status': 'failed', 'filename': None,
-                            'download_url': None, 'error': f'PowerPoint to PDF conversion failed: {str(e)}',
-                            'metadata': {}, 'method': 'powerpoint-to-pdf'
-                        })
-                    else:
-                        conversion_storage[conversion_id] = {
-                            'conversion_id': conversion_id, 'success': False, 'status': 'failed',
-                            'filename': None, 'download_url': None, 'error': f'PowerPoint to PDF conversion failed: {str(e)}',
-                            'metadata': {}, 'method': 'powerpoint-to-pdf'
-                        }
                     print(f"Stored error result for {conversion_id}")
-                print(f"Async conversion completed for {conversion_id}. Available conversions: {list(conversion_storage.keys())}")
-
-            thread = threading.Thread(target=convert_async)
-            thread.daemon = True
-            thread.start()
-
-            self._send_json_response({
-                'success': True, 'conversion_id': conversion_id,
-                'message': 'PowerPoint to PDF conversion started',
-                'status_url': f'/api/status/{conversion_id}'
-            }, 202)
-
-        except Exception as e:
-            self.log_message(f"Error in PowerPoint to PDF conversion: {e}")
-            self._send_error_response(500, f'Conversion failed: {str(e)}')
-
-    def handle_excel_to_pdf_conversion(self):
-        """Handle Excel to PDF conversion requests"""
-        try:
-            content_type = self.headers.get('Content-Type', '')
-            if not content_type.startswith('multipart/form-data'):
-                self._send_error_response(400, 'Content-Type must be multipart/form-data')
-                return
-
-            content_length = int(self.headers.get('Content-Length', 0))
-            if content_length == 0:
-                self._send_error_response(400, 'No file uploaded')
-                return
+                finally:
+                    try: os.remove(upload['path'])
+                    except: pass
 
-            body = self.rfile.read(content_length)
-            boundary = content_type.split('boundary=')[1].encode()
-            parts = body.split(b'--' + boundary)
-
-            excel_file_content = None
-            excel_filename = None
-
-            for part in parts:
-                if b'Content-Disposition' in part and b'filename=' in part:
-                    lines = part.split(b'\r\n')
-                    for line in lines:
-                        if b'Content-Disposition' in line:
-                            if b'filename=' in line:
-                                filename_part = line.split(b'filename=')[1]
-                                excel_filename = filename_part.strip(b'"').decode('utf-8')
-                                break
-                    if b'\r\n\r\n' in part:
-                        excel_file_content = part.split(b'\r\n\r\n', 1)[1]
-                        if excel_file_content.endswith(b'\r\n'):
-                            excel_file_content = excel_file_content[:-2]
-                        break
-
-            if not excel_file_content or not excel_filename:
-                self._send_error_response(400, 'No valid Excel file found in request')
+            if not self._submit_conversion(conversion_id, convert_async):
                 return
 
-            conversion_id = str(uuid.uuid4())
-            excel_temp_path = os.path.join(temp_dir, f"{conversion_id}_{excel_filename}")
-            with open(excel_temp_path, 'wb') as f:
-                f.write(excel_file_content)
-
-            conversion_storage[conversion_id] = {
-                'conversion_id': conversion_id, 'success': False, 'status': 'processing',
-                'filename': None, 'download_url': None, 'error': None, 'metadata': {},
-                'method': 'excel-to-pdf'
-            }
-
-            def convert_async():
-                try:
-                    print(f"Starting async Excel to PDF conversion for {conversion_id}")
-                    result = excel_to_pdf_converter.convert_excel_to_pdf(excel_temp_path)
-                    print(f"Conversion result for {conversion_id}: {result}")
-                    if result.get('success'):
-                        base_name = os.path.splitext(excel_filename)[0]
-                        output_filename = f"{conversion_id}_{base_name}_converted.pdf"
-                        final_output_path = os.path.join(temp_dir, output_filename)
-                        try:
-                            if os.path.exists(result['output_path']):
-                                print(f"Moving file from {result['output_path']} to {final_output_path}")
-                                shutil.move(result['output_path'], final_output_path)
-                                result['output_path'] = final_output_path
-                                result['filename'] = output_filename
-                                print(f"File successfully moved to {final_output_path}")
-                            else:
-                                print(f"Warning: Output file {result['output_path']} does not exist")
-                                result['filename'] = os.path.basename(result.get('output_path', 'unknown_output.pdf'))
-                        except Exception as move_error:
-                            print(f"Error moving file: {move_error}")
-                            result['filename'] = os.path.basename(result.get('output_path', 'unknown_output.pdf'))
-                    result['conversion_id'] = conversion_id
-                    conversion_storage[conversion_id].update({
-                        'success': result.get('success', True), 'status': 'completed', 'filename': result.get('filename'),
-                        'output_path': result.get('output_path'),
-                        'download_url': f'/api/download/{conversion_id}/{result.get("filename", "")}' if result.get('success') and result.get('filename') else None,
-                        'error': None, 'metadata': result.get('metadata', {}), 'method': result.get('method', 'excel-to-pdf')
-                    })
-                    print(f"Stored result for {conversion_id} in conversion_storage")
-                    try:
-                        os.remove(excel_temp_path)
-                        print(f"Cleaned up temp file {excel_temp_path}")
-                    except:
-                        pass
-                except Exception as e:
-                    print(f"Exception in convert_async for {conversion_id}: {str(e)}")
-                    if conversion_id in conversion_storage:
-                        conversion_storage[conversion_id].update({
-                            'success': False, 'status': 'failed', 'filename': None,
-                            'download_url': None, 'error': f'Excel to PDF conversion failed: {str(e)}',
-                            'metadata': {}, 'method': 'excel-to-pdf'
-                        })
-                    else:
-                        conversion_storage[conversion_id] = {
-                            'conversion_id': conversion_id, 'success': False, 'status': 'failed',
-                            'filename': None, 'download_url': None, 'error': f'Excel to PDF conversion failed: {str(e)}',
-                            'metadata': {}, 'method': 'excel-to-pdf'
-                        }
-                    print(f"Stored error result for {conversion_id}")
-                print(f"Async conversion completed for {conversion_id}. Available conversions: {list(conversion_storage.keys())}")
-
-            thread = threading.Thread(target=convert_async)
-            thread.daemon = True
-            thread.start()
-
             self._send_json_response({
-                'success': True, 'conversion_id': conversion_id,
-                'message': 'Excel to PDF conversion started',
+                'success': True, 'conversion_id': conversion_id, 'status': 'processing',
+                'message': f"{spec['label']} conversion started",
                 'status_url': f'/api/status/{conversion_id}'
             }, 202)
 
         except Exception as e:
-            self.log_message(f"Error in Excel to PDF conversion: {e}")
+            self.log_message(f"Error in {spec['label']} conversion: {e}")
             self._send_error_response(500, f'Conversion failed: {str(e)}')
 
     def handle_html_to_pdf_conversion(self):
@@ -1031,8 +707,26 @@ class APIHandler(BaseHTTPRequestHandler):
                 self._send_error_response(400, 'No data provided')
                 return
 
-            body = self.rfile.read(content_length)
-            conversion_id = str(uuid.uuid4())
+            conversion_id = secrets.token_urlsafe(16)
+            job_dir = os.path.join(temp_dir, conversion_id)
+            upload = None
+            body = None
+
+            if content_type.startswith('multipart/form-data'):
+                boundary_match = BOUNDARY_RE.search(content_type)
+                if not boundary_match:
+                    self._send_error_response(400, 'Content-Type has no multipart boundary')
+                    return
+                # Stream the uploaded file to disk like the other upload endpoints
+                os.mkdir(job_dir)
+                upload = _receive_multipart(self.rfile, content_length, boundary_match.group(1).encode(), job_dir, conversion_id)
+                if not upload:
+                    shutil.rmtree(job_dir, ignore_errors=True)
+                    self._send_error_response(400, 'No valid HTML file found in request')
+                    return
+            else:
+                # HTML code, JSON or a URL: small enough to read whole
+                body = self.rfile.read(content_length)
 
             # Initialize storage
             conversion_storage[conversion_id] = {
@@ -1045,40 +739,13 @@ class APIHandler(BaseHTTPRequestHandler):
                 try:
                     result = None
 
-                    if content_type.startswith('multipart/form-data'):
+                    if upload:
                         # Handle file upload
-                        boundary = content_type.split('boundary=')[1].encode()
-                        parts = body.split(b'--' + boundary)
-
-                        html_file_content = None
-                        html_filename = None
-
-                        for part in parts:
-                            if b'Content-Disposition' in part and b'filename=' in part:
-                                lines = part.split(b'\r\n')
-                                for line in lines:
-                                    if b'Content-Disposition' in line:
-                                        if b'filename=' in line:
-                                            filename_part = line.split(b'filename=')[1]
-                                            html_filename = filename_part.strip(b'"').decode('utf-8')
-                                            break
-                                if b'\r\n\r\n' in part:
-                                    html_file_content = part.split(b'\r\n\r\n', 1)[1]
-                                    if html_file_content.endswith(b'\r\n'):
-                                        html_file_content = html_file_content[:-2]
-                                    break
-
-                        if html_file_content and html_filename:
-                            # Save temp file and convert
-                            html_temp_path = os.path.join(temp_dir, f"{conversion_id}_{html_filename}")
-                            with open(html_temp_path, 'wb') as f:
-                                f.write(html_file_content)
-
-                            result = html_to_pdf_converter.convert_html_file_to_pdf(html_temp_path)
-
-                            # Cleanup
-                            try: os.remove(html_temp_path)
-                            except: pass
+                        result = _run_in_process(html_to_pdf_converter.convert_html_file_to_pdf, upload['path'])
+
+                        # Cleanup
+                        try: os.remove(upload['path'])
+                        except: pass
 
                     elif content_type.startswith('application/json'):
                         # Handle JSON data (HTML code or URL)
@@ -1088,7 +755,7 @@ class APIHandler(BaseHTTPRequestHandler):
 
                             if 'html_code' in data:
                                 # Convert HTML code
-                                result = html_to_pdf_converter.convert_html_code_to_pdf(data['html_code'])
+                                result = _run_in_process(html_to_pdf_converter.convert_html_code_to_pdf, data['html_code'])
                             elif 'url' in data:
                                 # Convert URL
                                 result = html_to_pdf_converter.convert_url_to_pdf(data['url'])
@@ -1102,7 +769,7 @@ class APIHandler(BaseHTTPRequestHandler):
                         # Try to parse as HTML code directly
                         try:
                             html_code = body.decode('utf-8')
-                            result = html_to_pdf_converter.convert_html_code_to_pdf(html_code)
+                            result = _run_in_process(html_to_pdf_converter.convert_html_code_to_pdf, html_code)
                         except:
                             result = {"success": False, "error": "Unable to parse request data"}
 
@@ -1113,18 +780,22 @@ class APIHandler(BaseHTTPRequestHandler):
                     if result.get('success'):
                         base_name = f"html_converted_{conversion_id}"
                         output_filename = f"{base_name}.pdf"
-                        final_output_path = os.path.join(temp_dir, output_filename)
+                        final_output_path = os.path.join(job_dir, output_filename)
 
                         if os.path.exists(result['output_path']):
+                            os.makedirs(job_dir, exist_ok=True)
                             shutil.move(result['output_path'], final_output_path)
                             result['output_path'] = final_output_path
                             result['filename'] = output_filename
+                        else:
+                            print(f"Output file {result['output_path']} does not exist")
+                            result.update({'success': False, 'error': 'HTML to PDF conversion produced no output file'})
 
                     result['conversion_id'] = conversion_id
                     conversion_storage[conversion_id].update({
                         'success': result.get('success', False), 'status': 'completed', 'filename': result.get('filename'),
                         'output_path': result.get('output_path'),
-                        'download_url': f'/api/download/{conversion_id}/{result.get("filename", "")}' if result.get('success') and result.get('filename') else None,
+                        'download_url': f'/api/download/{conversion_id}/{urllib.parse.quote(result["filename"])}' if result.get('success') and result.get('filename') else None,
                         'error': result.get('error'), 'metadata': result.get('metadata', {}), 'method': result.get('method', 'html-to-pdf')
                     })
 
@@ -1136,9 +807,8 @@ class APIHandler(BaseHTTPRequestHandler):
                         'metadata': {}, 'method': 'html-to-pdf'
                     })
 
-            thread = threading.Thread(target=convert_async)
-            thread.daemon = True
-            thread.start()
+            if not self._submit_conversion(conversion_id, convert_async):
+                return
 
             self._send_json_response({
                 'success': True, 'conversion_id': conversion_id,
@@ -1152,15 +822,27 @@ class APIHandler(BaseHTTPRequestHandler):
 
 
     def log_message(self, format, *args):
-        # Custom logging format
-        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {format % args}")
+        # Custom logging format; the listener thread adds the timestamp
+        request_logger.info(format, *args)
+
+    def log_request(self, code='-', size='-'):
+        # Successful requests are mostly status polls; only log the rest
+        if isinstance(code, int) and 200 <= code < 300:
+            return
+        super().log_request(code, size)
 
 def run_server(port=None):
     # Use environment variable for port, default to 8000
     if port is None:
         port = int(os.environ.get('BACKEND_PORT', 8000))
     server_address = ('0.0.0.0', port)
-    httpd = HTTPServer(server_address, APIHandler)
+    # One thread per connection, so a slow upload or download doesn't hold up
+    # status polls. Conversion state and files live in this process, so the
+    # server stays a single process rather than forking SO_REUSEPORT workers
+    httpd = ThreadingHTTPServer(server_address, APIHandler)
+    log_listener.start()
+    atexit.register(log_listener.stop)
+    threading.Thread(target=_reap_temp_dir, name='temp-reaper', daemon=True).start()
     print(f"Starting Python backend server on http://0.0.0.0:{port}")
     print(f"Server ready and listening on port {port}")
     print("Available endpoints:")
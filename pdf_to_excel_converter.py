@@ -7,21 +7,31 @@ Uses multiple methods for optimal conversion quality with advanced data extracti
 """
 
 import os
+import math
 import tempfile
 import traceback
-import shutil
 from pathlib import Path
 from typing import Dict, Any, Optional, List, Tuple
-import uuid
 import re
+from concurrent.futures import ProcessPoolExecutor
 
 try:
     import openpyxl
     from openpyxl import Workbook
-    from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
+    from openpyxl.styles import Font, PatternFill, Border, Side
     from openpyxl.utils.dataframe import dataframe_to_rows
-    from openpyxl.drawing.image import Image as ExcelImage
     print("openpyxl successfully imported")
+
+    # Shared cell styles, built once instead of for every written cell
+    HEADER_FONT = Font(bold=True)
+    HEADER_FILL = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
+    TABLE_TITLE_FONT = Font(bold=True, size=12)
+    THIN_BORDER = Border(
+        left=Side(style='thin'),
+        right=Side(style='thin'),
+        top=Side(style='thin'),
+        bottom=Side(style='thin')
+    )
 except ImportError as e:
     print(f"Warning: openpyxl not available - {e}")
     openpyxl = None
@@ -68,12 +78,78 @@ except ImportError as e:
     print(f"Warning: camelot-py not available - {e}")
     camelot = None
 
+# Table extraction strategies for the pdfplumber method, tried in order
+PDFPLUMBER_TABLE_STRATEGIES = [
+    {"vertical_strategy": "lines", "horizontal_strategy": "lines"},
+    {"vertical_strategy": "text", "horizontal_strategy": "text"},
+    {"vertical_strategy": "lines_strict", "horizontal_strategy": "lines_strict"},
+]
+
+# Per-process handle opened by _init_page_worker
+_WORKER_PDF = None
+
+def _init_page_worker(pdf_path: str):
+    """ProcessPoolExecutor initializer: open the PDF once for this worker"""
+    global _WORKER_PDF
+    _WORKER_PDF = pdfplumber.open(pdf_path)
+
+def _extract_worker_page(page_num: int) -> Dict[str, Any]:
+    """Extract one page from the worker's already open PDF"""
+    page = _WORKER_PDF.pages[page_num]
+    try:
+        return _extract_page_tables(page)
+    finally:
+        page.close()
+
+def _extract_page_tables(page) -> Dict[str, Any]:
+    """Extract a page's tables, or its text when no strategy finds a table.
+
+    Runs in worker processes, so it only returns plain picklable data.
+    """
+    for strategy in PDFPLUMBER_TABLE_STRATEGIES:
+        try:
+            page_tables = page.extract_tables(table_settings=strategy)
+            if page_tables:
+                return {"tables": page_tables, "strategy": strategy, "text": None}
+        except Exception as e:
+            continue
+    
+    return {"tables": [], "strategy": None, "text": page.extract_text()}
+
+# Per-process PyMuPDF document opened by _init_fitz_page_worker
+_WORKER_FITZ_DOC = None
+
+def _init_fitz_page_worker(pdf_path: str):
+    """ProcessPoolExecutor initializer: open the PDF with PyMuPDF once for this worker"""
+    global _WORKER_FITZ_DOC
+    _WORKER_FITZ_DOC = fitz.open(pdf_path)
+
+def _extract_fitz_worker_page(page_num: int) -> Dict[str, Any]:
+    """Extract one page from the worker's already open PyMuPDF document"""
+    return _extract_fitz_page_tables(_WORKER_FITZ_DOC.load_page(page_num))
+
+def _extract_fitz_page_tables(page) -> Dict[str, Any]:
+    """Extract a page's tables with PyMuPDF, or its text when there are none.
+
+    Runs in worker processes, so it only returns plain picklable data;
+    failures are reported back instead of raised so other pages carry on.
+    """
+    try:
+        tables = page.find_tables()
+        if tables:
+            return {"tables": [table.extract() for table in tables], "text": None, "error": None}
+        return {"tables": [], "text": page.get_text(), "error": None}
+    except Exception as e:
+        return {"tables": [], "text": None, "error": str(e)}
+
 class PDFToExcelConverter:
     """Advanced PDF to Excel converter with comprehensive table and data extraction"""
     
-    def __init__(self, output_dir: str = None):
+    def __init__(self, output_dir: str = None, page_workers: int = None):
         self.output_dir = output_dir or tempfile.mkdtemp()
         Path(self.output_dir).mkdir(parents=True, exist_ok=True)
+        # Upper bound on the processes one conversion spreads its pages across
+        self.page_workers = page_workers or os.cpu_count() or 1
         
     def convert_pdf_to_excel(self, pdf_path: str, output_filename: str = None) -> Dict[str, Any]:
         """
@@ -196,16 +272,11 @@ class PDFToExcelConverter:
                                     
                                     # Apply formatting for first row
                                     if r_idx == 1:
-                                        cell.font = Font(bold=True)
-                                        cell.fill = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
+                                        cell.font = HEADER_FONT
+                                        cell.fill = HEADER_FILL
                                     
                                     # Add borders
-                                    cell.border = Border(
-                                        left=Side(style='thin'),
-                                        right=Side(style='thin'),
-                                        top=Side(style='thin'),
-                                        bottom=Side(style='thin')
-                                    )
+                                    cell.border = THIN_BORDER
                         
                         # Auto-adjust column widths
                         for column in ws.columns:
@@ -214,8 +285,9 @@ class PDFToExcelConverter:
                             
                             for cell in column:
                                 try:
-                                    if len(str(cell.value)) > max_length:
-                                        max_length = len(str(cell.value))
+                                    cell_length = len(str(cell.value))
+                                    if cell_length > max_length:
+                                        max_length = cell_length
                                 except:
                                     pass
                             
@@ -277,16 +349,11 @@ class PDFToExcelConverter:
                                 
                                 # Apply formatting for first row
                                 if r_idx == 1:
-                                    cell.font = Font(bold=True)
-                                    cell.fill = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
+                                    cell.font = HEADER_FONT
+                                    cell.fill = HEADER_FILL
                                 
                                 # Add borders
-                                cell.border = Border(
-                                    left=Side(style='thin'),
-                                    right=Side(style='thin'),
-                                    top=Side(style='thin'),
-                                    bottom=Side(style='thin')
-                                )
+                                cell.border = THIN_BORDER
                     
                     # Auto-adjust column widths
                     for column in ws.columns:
@@ -295,8 +362,9 @@ class PDFToExcelConverter:
                         
                         for cell in column:
                             try:
-                                if len(str(cell.value)) > max_length:
-                                    max_length = len(str(cell.value))
+                                cell_length = len(str(cell.value))
+                                if cell_length > max_length:
+                                    max_length = cell_length
                             except:
                                 pass
                         
@@ -328,39 +396,40 @@ class PDFToExcelConverter:
                 wb.remove(wb.active)
             
             with pdfplumber.open(pdf_path) as pdf:
-                for page_num, page in enumerate(pdf.pages):
+                page_count = len(pdf.pages)
+                
+                # Table detection is pure Python, so spread pages across processes
+                # that each open the PDF once; openpyxl sheets are built here in order.
+                executor = None
+                if min(self.page_workers, page_count) > 1:
+                    # One run of adjacent pages per worker, so each worker's pdfminer
+                    # font/resource cache keeps getting hits
+                    chunksize = math.ceil(page_count / min(self.page_workers, page_count))
+                    executor = ProcessPoolExecutor(
+                        max_workers=math.ceil(page_count / chunksize),
+                        initializer=_init_page_worker,
+                        initargs=(pdf_path,)
+                    )
+                    page_contents = executor.map(_extract_worker_page, range(page_count), chunksize=chunksize)
+                else:
+                    page_contents = [_extract_page_tables(page) for page in pdf.pages]
+            
+            try:
+                for page_num, content in enumerate(page_contents):
                     print(f"Processing page {page_num + 1} with pdfplumber")
                     
                     sheet_name = f"Page_{page_num + 1}"
                     ws = wb.create_sheet(title=sheet_name)
                     current_row = 1
                     
-                    # Extract tables with different settings
-                    tables = []
-                    
-                    # Try different table extraction strategies
-                    strategies = [
-                        {"vertical_strategy": "lines", "horizontal_strategy": "lines"},
-                        {"vertical_strategy": "text", "horizontal_strategy": "text"},
-                        {"vertical_strategy": "lines_strict", "horizontal_strategy": "lines_strict"},
-                    ]
-                    
-                    for strategy in strategies:
-                        try:
-                            page_tables = page.extract_tables(table_settings=strategy)
-                            if page_tables:
-                                tables.extend(page_tables)
-                                print(f"Found {len(page_tables)} tables with strategy {strategy}")
-                                break
-                        except Exception as e:
-                            continue
-                    
+                    tables = content["tables"]
                     if tables:
+                        print(f"Found {len(tables)} tables with strategy {content['strategy']}")
                         for table_idx, table in enumerate(tables):
                             if table and any(any(cell for cell in row if cell) for row in table):
                                 # Add table title
                                 title_cell = ws.cell(row=current_row, column=1, value=f"Table {table_idx + 1}")
-                                title_cell.font = Font(bold=True, size=12)
+                                title_cell.font = TABLE_TITLE_FONT
                                 current_row += 1
                                 
                                 # Process table data
@@ -375,16 +444,11 @@ class PDFToExcelConverter:
                                                     
                                                     # Apply formatting for header row
                                                     if row_idx == 0:
-                                                        cell.font = Font(bold=True)
-                                                        cell.fill = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
+                                                        cell.font = HEADER_FONT
+                                                        cell.fill = HEADER_FILL
                                                     
                                                     # Add borders
-                                                    cell.border = Border(
-                                                        left=Side(style='thin'),
-                                                        right=Side(style='thin'),
-                                                        top=Side(style='thin'),
-                                                        bottom=Side(style='thin')
-                                                    )
+                                                    cell.border = THIN_BORDER
                                         
                                         current_row += 1
                                 
@@ -392,7 +456,7 @@ class PDFToExcelConverter:
                     
                     else:
                         # No tables found, extract text and try to parse structured data
-                        text = page.extract_text()
+                        text = content["text"]
                         if text:
                             print(f"No tables found on page {page_num + 1}, extracting text")
                             lines = text.split('\n')
@@ -413,6 +477,9 @@ class PDFToExcelConverter:
                                     if line.strip():
                                         ws.cell(row=current_row, column=1, value=line.strip())
                                         current_row += 1
+            finally:
+                if executor:
+                    executor.shutdown(cancel_futures=True)
             
             # Auto-adjust column widths for all sheets
             for sheet in wb.worksheets:
@@ -422,8 +489,9 @@ class PDFToExcelConverter:
                     
                     for cell in column:
                         try:
-                            if len(str(cell.value)) > max_length:
-                                max_length = len(str(cell.value))
+                            cell_length = len(str(cell.value))
+                            if cell_length > max_length:
+                                max_length = cell_length
                         except:
                             pass
                     
@@ -445,84 +513,98 @@ class PDFToExcelConverter:
             
             print("Attempting PyMuPDF enhanced extraction...")
             doc = fitz.open(pdf_path)
+            page_count = len(doc)
             wb = Workbook()
             
             # Remove default sheet
             if wb.worksheets:
                 wb.remove(wb.active)
             
-            for page_num in range(len(doc)):
-                page = doc.load_page(page_num)
-                sheet_name = f"Page_{page_num + 1}"
-                ws = wb.create_sheet(title=sheet_name)
-                
-                print(f"Processing page {page_num + 1} with PyMuPDF")
-                current_row = 1
-                
-                # Extract tables
-                try:
-                    tables = page.find_tables()
-                    if tables:
-                        for table_idx, table in enumerate(tables):
-                            print(f"Found table {table_idx + 1} on page {page_num + 1}")
-                            
-                            # Add table title
-                            title_cell = ws.cell(row=current_row, column=1, value=f"Table {table_idx + 1}")
-                            title_cell.font = Font(bold=True, size=12)
-                            current_row += 1
-                            
-                            # Extract table data
-                            table_data = table.extract()
-                            
-                            for row_idx, row_data in enumerate(table_data):
-                                if row_data and any(cell for cell in row_data if cell):
-                                    for col_idx, cell_value in enumerate(row_data):
-                                        if cell_value:
-                                            cleaned_value = str(cell_value).strip()
-                                            if cleaned_value:
-                                                cell = ws.cell(row=current_row, column=col_idx + 1, value=cleaned_value)
-                                                
-                                                # Apply formatting for header row
-                                                if row_idx == 0:
-                                                    cell.font = Font(bold=True)
-                                                    cell.fill = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
-                                                
-                                                # Add borders
-                                                cell.border = Border(
-                                                    left=Side(style='thin'),
-                                                    right=Side(style='thin'),
-                                                    top=Side(style='thin'),
-                                                    bottom=Side(style='thin')
-                                                )
-                                    
-                                    current_row += 1
-                            
-                            current_row += 2  # Space between tables
+            # find_tables does most of its work in Python, so spread pages across
+            # processes that each open the PDF once; sheets are built here in order
+            executor = None
+            if min(self.page_workers, page_count) > 1:
+                doc.close()
+                chunksize = math.ceil(page_count / min(self.page_workers, page_count))
+                executor = ProcessPoolExecutor(
+                    max_workers=math.ceil(page_count / chunksize),
+                    initializer=_init_fitz_page_worker,
+                    initargs=(pdf_path,)
+                )
+                page_contents = executor.map(_extract_fitz_worker_page, range(page_count), chunksize=chunksize)
+            else:
+                page_contents = [_extract_fitz_page_tables(page) for page in doc]
+                doc.close()
+            
+            try:
+                for page_num, content in enumerate(page_contents):
+                    sheet_name = f"Page_{page_num + 1}"
+                    ws = wb.create_sheet(title=sheet_name)
                     
-                    else:
-                        # No tables found, extract text
-                        text = page.get_text()
-                        if text:
-                            lines = text.split('\n')
-                            structured_data = self._extract_structured_text_data(lines)
-                            
-                            if structured_data:
-                                for row_data in structured_data:
-                                    for col_idx, value in enumerate(row_data):
-                                        if value.strip():
-                                            ws.cell(row=current_row, column=col_idx + 1, value=value.strip())
-                                    current_row += 1
-                            else:
-                                for line in lines:
-                                    if line.strip():
-                                        ws.cell(row=current_row, column=1, value=line.strip())
+                    print(f"Processing page {page_num + 1} with PyMuPDF")
+                    current_row = 1
+                    
+                    if content["error"]:
+                        print(f"Error processing page {page_num + 1}: {content['error']}")
+                        continue
+                    
+                    try:
+                        # Extract tables
+                        tables = content["tables"]
+                        if tables:
+                            for table_idx, table_data in enumerate(tables):
+                                print(f"Found table {table_idx + 1} on page {page_num + 1}")
+                                
+                                # Add table title
+                                title_cell = ws.cell(row=current_row, column=1, value=f"Table {table_idx + 1}")
+                                title_cell.font = TABLE_TITLE_FONT
+                                current_row += 1
+                                
+                                for row_idx, row_data in enumerate(table_data):
+                                    if row_data and any(cell for cell in row_data if cell):
+                                        for col_idx, cell_value in enumerate(row_data):
+                                            if cell_value:
+                                                cleaned_value = str(cell_value).strip()
+                                                if cleaned_value:
+                                                    cell = ws.cell(row=current_row, column=col_idx + 1, value=cleaned_value)
+                                                    
+                                                    # Apply formatting for header row
+                                                    if row_idx == 0:
+                                                        cell.font = HEADER_FONT
+                                                        cell.fill = HEADER_FILL
+                                                    
+                                                    # Add borders
+                                                    cell.border = THIN_BORDER
+                                        
                                         current_row += 1
+                                
+                                current_row += 2  # Space between tables
                         
-                except Exception as e:
-                    print(f"Error processing page {page_num + 1}: {e}")
-                    continue
-            
-            doc.close()
+                        else:
+                            # No tables found, extract text
+                            text = content["text"]
+                            if text:
+                                lines = text.split('\n')
+                                structured_data = self._extract_structured_text_data(lines)
+                                
+                                if structured_data:
+                                    for row_data in structured_data:
+                                        for col_idx, value in enumerate(row_data):
+                                            if value.strip():
+                                                ws.cell(row=current_row, column=col_idx + 1, value=value.strip())
+                                        current_row += 1
+                                else:
+                                    for line in lines:
+                                        if line.strip():
+                                            ws.cell(row=current_row, column=1, value=line.strip())
+                                            current_row += 1
+                    
+                    except Exception as e:
+                        print(f"Error processing page {page_num + 1}: {e}")
+                        continue
+            finally:
+                if executor:
+                    executor.shutdown(cancel_futures=True)
             
             # Auto-adjust column widths
             for sheet in wb.worksheets:
@@ -532,8 +614,9 @@ class PDFToExcelConverter:
                     
                     for cell in column:
                         try:
-                            if len(str(cell.value)) > max_length:
-                                max_length = len(str(cell.value))
+                            cell_length = len(str(cell.value))
+                            if cell_length > max_length:
+                                max_length = cell_length
                         except:
                             pass
                     
@@ -622,8 +705,9 @@ class PDFToExcelConverter:
                 
                 for cell in column:
                     try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
+                        cell_length = len(str(cell.value))
+                        if cell_length > max_length:
+                            max_length = cell_length
                     except:
                         pass
                 
@@ -10,11 +10,12 @@ import os
 import tempfile
 import traceback
 import shutil
-import io
 from pathlib import Path
 from typing import Dict, Any, Optional, List, Tuple
 import uuid
 import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
 
 try:
     from pdf2image import convert_from_path, convert_from_bytes
@@ -40,6 +41,13 @@ except ImportError as e:
     print(f"Warning: PyMuPDF not available - {e}")
     fitz = None
 
+# Pillow releases the GIL while compressing, so page encodes can overlap
+ENCODE_WORKERS = min(8, os.cpu_count() or 1)
+_encode_executor = ThreadPoolExecutor(max_workers=ENCODE_WORKERS)
+# Every queued encode holds a full rendered page in memory, so rendering
+# waits for the oldest encode once this many are in flight
+MAX_PENDING_ENCODES = 2 * ENCODE_WORKERS
+
 class PDFToJPGConverter:
     """Advanced PDF to JPG converter with high-quality image output"""
     
@@ -84,12 +92,14 @@ class PDFToJPGConverter:
             base_name = Path(pdf_path).stem
             conversion_id = str(uuid.uuid4())[:8]
             
-            # Try multiple conversion methods in order of quality
+            # Try multiple conversion methods in order of quality. PyMuPDF renders
+            # in-process, while pdf2image forks pdftoppm and re-reads every page as
+            # PPM, so the PyMuPDF methods go first and pdf2image is the fallback.
             methods = [
-                ("pdf2image_enhanced", self._convert_with_pdf2image_enhanced),
                 ("pymupdf_enhanced", self._convert_with_pymupdf_enhanced),
-                ("pdf2image_basic", self._convert_with_pdf2image_basic),
-                ("pymupdf_basic", self._convert_with_pymupdf_basic)
+                ("pdf2image_enhanced", self._convert_with_pdf2image_enhanced),
+                ("pymupdf_basic", self._convert_with_pymupdf_basic),
+                ("pdf2image_basic", self._convert_with_pdf2image_basic)
             ]
             
             for method_name, method_func in methods:
@@ -125,62 +135,68 @@ class PDFToJPGConverter:
             
             print(f"Converting with pdf2image at {dpi} DPI...")
             
-            # Convert PDF to images with high quality settings
+            # Convert PDF to images with high quality settings; only the first
+            # page is rendered when that is all that was asked for
             images = convert_from_path(
                 pdf_path,
                 dpi=dpi,
                 fmt='RGB',  # Ensure RGB color space
                 thread_count=4,  # Use multiple threads for faster conversion
                 use_cropbox=True,  # Use crop box for better accuracy
-                strict=True  # Strict mode for better quality
+                strict=True,  # Strict mode for better quality
+                last_page=1 if page_range == 'first' else None
             )
             
             if not images:
                 return {"success": False, "error": "No images generated from PDF"}
             
-            # Process page range
-            if page_range == 'first' and len(images) > 1:
-                images = [images[0]]
-            
             converted_files = []
+            pending = deque()
             temp_dir = os.path.join(self.output_dir, f"conversion_{conversion_id}")
             os.makedirs(temp_dir, exist_ok=True)
             
-            for i, image in enumerate(images):
-                page_num = i + 1
-                
-                # Enhance image quality
-                enhanced_image = self._enhance_image_quality(image, dpi)
-                
-                # Generate filename
-                if len(images) == 1:
-                    filename = f"{base_name}_converted.{output_format.lower()}"
-                else:
-                    filename = f"{base_name}_page_{page_num:03d}.{output_format.lower()}"
-                
-                output_path = os.path.join(temp_dir, filename)
-                
-                # Save with optimal settings
-                save_kwargs = {
-                    'optimize': True,
-                    'progressive': True if output_format.lower() == 'jpg' else False
-                }
-                
-                if output_format.lower() in ['jpg', 'jpeg']:
-                    save_kwargs['quality'] = quality
-                    save_kwargs['subsampling'] = 0  # No subsampling for better quality
-                elif output_format.lower() == 'png':
-                    save_kwargs['compress_level'] = 1  # Minimal compression for PNG
-                
-                enhanced_image.save(output_path, output_format.upper(), **save_kwargs)
-                converted_files.append({
-                    'filename': filename,
-                    'path': output_path,
-                    'page': page_num,
-                    'size_mb': round(os.path.getsize(output_path) / (1024 * 1024), 2)
-                })
+            try:
+                for i, image in enumerate(images):
+                    page_num = i + 1
+                    
+                    # Enhance image quality; the list no longer needs the original
+                    enhanced_image = self._enhance_image_quality(image, dpi)
+                    images[i] = image = None
+                    
+                    # Generate filename
+                    if len(images) == 1:
+                        filename = f"{base_name}_converted.{output_format.lower()}"
+                    else:
+                        filename = f"{base_name}_page_{page_num:03d}.{output_format.lower()}"
+                    
+                    output_path = os.path.join(temp_dir, filename)
+                    
+                    # Save with optimal settings
+                    save_kwargs = {
+                        'optimize': True,
+                        'progressive': True if output_format.lower() == 'jpg' else False
+                    }
+                    
+                    if output_format.lower() in ['jpg', 'jpeg']:
+                        save_kwargs['quality'] = quality
+                        save_kwargs['subsampling'] = 0  # No subsampling for better quality
+                    elif output_format.lower() == 'png':
+                        save_kwargs['optimize'] = False  # optimize would force level 9
+                        save_kwargs['compress_level'] = 1  # Minimal compression for PNG
+                    
+                    file_info = {
+                        'filename': filename,
+                        'path': output_path,
+                        'page': page_num
+                    }
+                    converted_files.append(file_info)
+                    self._submit_encode(pending, enhanced_image, output_path, output_format.upper(), save_kwargs, file_info)
                 
-                print(f"Converted page {page_num} to {filename}")
+                self._wait_for_encodes(pending)
+            finally:
+                # After an error, stop the queued page writes before a fallback
+                # method writes the same filenames into temp_dir
+                self._abandon_encodes(pending)
             
             # Create ZIP file if multiple pages
             final_output_path = None
@@ -195,7 +211,8 @@ class PDFToJPGConverter:
                 zip_filename = f"{base_name}_converted_pages.zip"
                 zip_path = os.path.join(self.output_dir, zip_filename)
                 
-                with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+                # Pages are already JPEG/PNG compressed, so store them as-is
+                with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_STORED) as zipf:
                     for file_info in converted_files:
                         zipf.write(file_info['path'], file_info['filename'])
                 
@@ -235,6 +252,7 @@ class PDFToJPGConverter:
             
             doc = fitz.open(pdf_path)
             converted_files = []
+            pending = deque()
             temp_dir = os.path.join(self.output_dir, f"conversion_{conversion_id}")
             os.makedirs(temp_dir, exist_ok=True)
             
@@ -246,55 +264,60 @@ class PDFToJPGConverter:
             if page_range == 'first':
                 pages_to_convert = [0]
             
-            for page_num in pages_to_convert:
-                page = doc.load_page(page_num)
-                
-                # Render page as pixmap with high quality
-                pix = page.get_pixmap(matrix=mat, alpha=False)
-                
-                # Convert to PIL Image for enhancement
-                img_data = pix.tobytes("png")
-                pil_image = Image.open(io.BytesIO(img_data))
-                
-                # Enhance image quality
-                enhanced_image = self._enhance_image_quality(pil_image, dpi)
-                
-                # Generate filename
-                if len(pages_to_convert) == 1:
-                    filename = f"{base_name}_converted.{output_format.lower()}"
-                else:
-                    filename = f"{base_name}_page_{page_num + 1:03d}.{output_format.lower()}"
-                
-                output_path = os.path.join(temp_dir, filename)
-                
-                # Save with optimal settings
-                save_kwargs = {
-                    'optimize': True,
-                    'progressive': True if output_format.lower() in ['jpg', 'jpeg'] else False
-                }
-                
-                if output_format.lower() in ['jpg', 'jpeg']:
-                    save_kwargs['quality'] = quality
-                    save_kwargs['subsampling'] = 0
-                    # Use JPEG format for JPG files
-                    format_name = 'JPEG'
-                elif output_format.lower() == 'png':
-                    save_kwargs['compress_level'] = 1
-                    format_name = 'PNG'
-                else:
-                    format_name = output_format.upper()
-                
-                enhanced_image.save(output_path, format_name, **save_kwargs)
-                converted_files.append({
-                    'filename': filename,
-                    'path': output_path,
-                    'page': page_num + 1,
-                    'size_mb': round(os.path.getsize(output_path) / (1024 * 1024), 2)
-                })
+            try:
+                for page_num in pages_to_convert:
+                    page = doc.load_page(page_num)
+                    
+                    # Render page as pixmap with high quality
+                    pix = page.get_pixmap(matrix=mat, alpha=False)
+                    
+                    # Wrap the raw samples for enhancement (no PNG encode/decode round-trip)
+                    pil_image = self._pixmap_to_image(pix)
+                    
+                    # Enhance image quality
+                    enhanced_image = self._enhance_image_quality(pil_image, dpi)
+                    
+                    # Generate filename
+                    if len(pages_to_convert) == 1:
+                        filename = f"{base_name}_converted.{output_format.lower()}"
+                    else:
+                        filename = f"{base_name}_page_{page_num + 1:03d}.{output_format.lower()}"
+                    
+                    output_path = os.path.join(temp_dir, filename)
+                    
+                    # Save with optimal settings
+                    save_kwargs = {
+                        'optimize': True,
+                        'progressive': True if output_format.lower() in ['jpg', 'jpeg'] else False
+                    }
+                    
+                    if output_format.lower() in ['jpg', 'jpeg']:
+                        save_kwargs['quality'] = quality
+                        save_kwargs['subsampling'] = 0
+                        # Use JPEG format for JPG files
+                        format_name = 'JPEG'
+                    elif output_format.lower() == 'png':
+                        save_kwargs['optimize'] = False
+                        save_kwargs['compress_level'] = 1
+                        format_name = 'PNG'
+                    else:
+                        format_name = output_format.upper()
+                    
+                    file_info = {
+                        'filename': filename,
+                        'path': output_path,
+                        'page': page_num + 1
+                    }
+                    converted_files.append(file_info)
+                    # The pixmap rides along with its encode, since the image may share its buffer
+                    self._submit_encode(pending, enhanced_image, output_path, format_name, save_kwargs, file_info, pix)
                 
-                print(f"Converted page {page_num + 1} to {filename}")
-            
-            doc.close()
+                self._wait_for_encodes(pending)
+            finally:
+                # After an error, stop the queued page writes before a fallback
+                # method writes the same filenames into temp_dir
+                self._abandon_encodes(pending)
+                doc.close()
             
             # Handle output (single file or ZIP)
             if len(converted_files) == 1:
@@ -304,7 +327,8 @@ class PDFToJPGConverter:
                 zip_filename = f"{base_name}_converted_pages.zip"
                 zip_path = os.path.join(self.output_dir, zip_filename)
                 
-                with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+                # Pages are already JPEG/PNG compressed, so store them as-is
+                with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_STORED) as zipf:
                     for file_info in converted_files:
                         zipf.write(file_info['path'], file_info['filename'])
                 
@@ -338,13 +362,12 @@ class PDFToJPGConverter:
             if not convert_from_path:
                 return {"success": False, "error": "pdf2image not available"}
             
-            images = convert_from_path(pdf_path, dpi=dpi)
+            # Basic mode only writes single images, so never render past the
+            # second page: one more page is enough to know the PDF has several
+            images = convert_from_path(pdf_path, dpi=dpi, last_page=1 if page_range == 'first' else 2)
             if not images:
                 return {"success": False, "error": "No images generated"}
             
-            if page_range == 'first':
-                images = [images[0]]
-            
             if len(images) == 1:
                 filename = f"{base_name}_converted.{output_format.lower()}"
                 output_path = os.path.join(self.output_dir, filename)
@@ -383,14 +406,10 @@ class PDFToJPGConverter:
             filename = f"{base_name}_converted.{output_format.lower()}"
             output_path = os.path.join(self.output_dir, filename)
             
-            # Save with correct format
+            # Save with correct format; MuPDF encodes JPEG itself, so the pixmap
+            # doesn't need to go through PIL first
             if output_format.lower() in ['jpg', 'jpeg']:
-                # Convert pixmap to PIL Image for better format control
-                img_data = pix.tobytes("png")
-                pil_image = Image.open(io.BytesIO(img_data))
-                if pil_image.mode != 'RGB':
-                    pil_image = pil_image.convert('RGB')
-                pil_image.save(output_path, 'JPEG', quality=quality, optimize=True)
+                pix.save(output_path, output="jpg", jpg_quality=quality)
             else:
                 pix.save(output_path)
             doc.close()
@@ -406,6 +425,45 @@ class PDFToJPGConverter:
             print(f"PyMuPDF basic conversion failed: {e}")
             return {"success": False, "error": str(e)}
     
+    def _submit_encode(self, pending: deque, image, output_path: str, format_name: str,
+                       save_kwargs: Dict[str, Any], file_info: Dict[str, Any], pixmap=None):
+        """Queue a page encode, first finishing the oldest ones if MAX_PENDING_ENCODES are in flight.
+        ``pixmap`` is kept referenced until the encode is done and then released"""
+        while len(pending) >= MAX_PENDING_ENCODES:
+            self._finish_encode(*pending.popleft())
+        future = _encode_executor.submit(image.save, output_path, format_name, **save_kwargs)
+        pending.append((future, file_info, pixmap))
+
+    def _finish_encode(self, future, file_info: Dict[str, Any], pixmap=None):
+        """Wait for one page encode and record the resulting file size"""
+        future.result()
+        file_info['size_mb'] = round(os.path.getsize(file_info['path']) / (1024 * 1024), 2)
+        print(f"Converted page {file_info['page']} to {file_info['filename']}")
+
+    def _wait_for_encodes(self, pending: deque):
+        """Wait for all queued page encodes"""
+        while pending:
+            self._finish_encode(*pending.popleft())
+
+    def _abandon_encodes(self, pending: deque):
+        """Cancel queued page encodes that haven't started and wait for the running ones"""
+        for future, _, _ in pending:
+            future.cancel()
+        wait([future for future, _, _ in pending])
+        pending.clear()
+
+    def _pixmap_to_image(self, pix) -> Image.Image:
+        """Wrap a PyMuPDF pixmap's samples in a PIL image without copying.
+
+        The returned image shares memory with ``pix``, so the pixmap must be
+        kept alive until the image has been saved.
+        """
+        mode = "L" if pix.n - pix.alpha == 1 else "RGB"
+        if pix.alpha:
+            mode += "A"
+        return Image.frombuffer(mode, (pix.width, pix.height), pix.samples_mv,
+                                "raw", mode, pix.stride, 1)
+
     def _enhance_image_quality(self, image: Image.Image, dpi: int) -> Image.Image:
         """Enhance image quality with various filters and adjustments"""
         try:
@@ -7,31 +7,46 @@ Uses multiple methods for optimal conversion quality with advanced formatting pr
 """
 
 import os
+import io
 import tempfile
 import traceback
-import shutil
-from pathlib import Path
 from typing import Dict, Any, Optional, Tuple, List
-import uuid
 import re
+from concurrent.futures import ThreadPoolExecutor
 
 try:
     from pptx import Presentation
     from pptx.util import Inches, Pt
     from pptx.dml.color import RGBColor
-    from pptx.enum.text import PP_ALIGN
-    from pptx.enum.shapes import MSO_SHAPE_TYPE
     print("python-pptx successfully imported")
+
+    # Length and color values are immutable, so build the ones used in
+    # per-cell/per-paragraph loops once instead of on every assignment
+    TABLE_CELL_FONT_SIZE = Pt(9)
+    STRUCTURED_TEXT_FONT_SIZE = Pt(10)
+    STRUCTURED_TEXT_COLOR = RGBColor(50, 50, 50)
+    BODY_TEXT_FONT_SIZE = Pt(12)
+    BODY_TEXT_SPACE_AFTER = Pt(6)
+
+    # Extracted images are laid out in two fixed-size columns, and page renders
+    # cover the whole 10" x 7.5" slide
+    IMAGE_COLUMN_LEFT = (Inches(0.5), Inches(5.5))
+    IMAGE_WIDTH = Inches(4)
+    IMAGE_HEIGHT = Inches(3)
+    SLIDE_ORIGIN = Inches(0)
+    SLIDE_WIDTH = Inches(10)
+    SLIDE_HEIGHT = Inches(7.5)
 except ImportError as e:
     print(f"Warning: python-pptx not available - {e}")
     Presentation = None
 
 try:
-    from pdf2image import convert_from_path
+    from pdf2image import convert_from_path, pdfinfo_from_path
     print("pdf2image successfully imported")
 except ImportError as e:
     print(f"Warning: pdf2image not available - {e}")
     convert_from_path = None
+    pdfinfo_from_path = None
 
 try:
     import pdfplumber
@@ -41,7 +56,7 @@ except ImportError as e:
     pdfplumber = None
 
 try:
-    from PIL import Image, ImageEnhance, ImageFilter
+    from PIL import Image, ImageEnhance
     print("Pillow successfully imported")
 except ImportError as e:
     print(f"Warning: Pillow not available - {e}")
@@ -54,6 +69,20 @@ except ImportError as e:
     print(f"Warning: PyMuPDF not available - {e}")
     fitz = None
 
+# Embedded image formats python-pptx can place without re-encoding
+PPTX_IMAGE_EXTENSIONS = {"png", "jpeg", "gif", "bmp", "tiff"}
+
+# Full-page renders are embedded as JPEG (or palette PNG when they have few colors);
+# lossless RGB PNG made them several times larger
+PAGE_IMAGE_JPEG_QUALITY = 80
+
+# Text patterns used per line/block, compiled once
+COLUMN_GAP_PATTERN = re.compile(r'\s{2,}')
+BLANK_LINES_PATTERN = re.compile(r'\n\s*\n')
+INLINE_SPACE_PATTERN = re.compile(r'[ \t]+')
+# Bullet character, "1."-"5." prefix or any "<n>." / "<n>)" marker followed by a space
+LIST_ITEM_PATTERN = re.compile(r'[•\-*]|[1-5]\.|\d+[\.\)]\s')
+
 class PDFToPowerPointConverter:
     """Enhanced PDF to PowerPoint converter with advanced image and table handling"""
     
@@ -141,6 +170,9 @@ class PDFToPowerPointConverter:
             pdf_doc = fitz.open(pdf_path)
             prs = Presentation()
             
+            # Logos and headers reuse the same xref on many pages; extract each once
+            image_cache: Dict[int, Optional[Tuple[bytes, str]]] = {}
+            
             for page_num in range(len(pdf_doc)):
                 print(f"Processing page {page_num + 1} with PyMuPDF")
                 page = pdf_doc[page_num]
@@ -156,41 +188,32 @@ class PDFToPowerPointConverter:
                 for img_index, img in enumerate(image_list):
                     try:
                         xref = img[0]
-                        pix = fitz.Pixmap(pdf_doc, xref)
+                        if xref not in image_cache:
+                            image_cache[xref] = self._extract_image_bytes(pdf_doc, xref)
+                        extracted = image_cache[xref]
                         
-                        if pix.n - pix.alpha < 4:  # GRAY or RGB
-                            img_data = pix.tobytes("png")
-                            temp_img_path = os.path.join(self.temp_dir, f"page_{page_num}_img_{img_index}.png")
+                        if extracted:
+                            img_data, img_ext = extracted
                             
-                            with open(temp_img_path, "wb") as img_file:
-                                img_file.write(img_data)
-                            
-                            # Add image to slide
+                            # Add image to slide straight from memory
                             try:
                                 slide.shapes.add_picture(
-                                    temp_img_path,
-                                    Inches(0.5 + (img_index % 2) * 5),
+                                    io.BytesIO(img_data),
+                                    IMAGE_COLUMN_LEFT[img_index % 2],
                                     Inches(img_y_offset),
-                                    Inches(4),
-                                    Inches(3)
+                                    IMAGE_WIDTH,
+                                    IMAGE_HEIGHT
                                 )
                                 img_y_offset += 3.5
                             except:
                                 pass
-                            
-                            # Clean up temp image
-                            try:
-                                os.remove(temp_img_path)
-                            except:
-                                pass
-                        
-                        pix = None
                     except Exception as e:
                         print(f"Error processing image {img_index}: {e}")
                         continue
                 
-                # Extract text and tables
-                text_dict = page.get_text("dict")
+                # Extract text and tables; only text blocks are used, so skip
+                # embedding image data in the dict
+                text_dict = page.get_text("dict", flags=fitz.TEXTFLAGS_TEXT)
                 self._add_text_and_tables_to_slide(slide, text_dict, page_num)
             
             pdf_doc.close()
@@ -201,6 +224,32 @@ class PDFToPowerPointConverter:
             print(f"PyMuPDF conversion method failed: {e}")
             return False
 
+    def _extract_image_bytes(self, pdf_doc, xref: int) -> Optional[Tuple[bytes, str]]:
+        """Get an embedded image as (bytes, extension), or None if it can't be used.
+
+        JPEG/PNG/etc. streams are passed through untouched; other formats are
+        decoded once and re-encoded as PNG. CMYK images are converted to RGB,
+        which is the only case that pays for a colorspace conversion. Decoded
+        RGB images with at most 256 colors (diagrams, line art) are written as
+        8-bit palette PNGs, which are about a third of the size.
+        """
+        info = pdf_doc.extract_image(xref)
+        if info and info.get("ext") in PPTX_IMAGE_EXTENSIONS and info.get("colorspace", 0) < 4:
+            return info["image"], info["ext"]
+        
+        pix = fitz.Pixmap(pdf_doc, xref)
+        if pix.n - pix.alpha >= 4:  # CMYK
+            pix = fitz.Pixmap(fitz.csRGB, pix)
+        
+        # Count colors on the pixmap itself, so photos never get copied into PIL
+        if Image and pix.n == 3 and not pix.alpha and pix.color_count() <= 256:
+            rgb_image = Image.frombytes("RGB", (pix.width, pix.height), pix.samples_mv)
+            image_buffer = io.BytesIO()
+            rgb_image.convert("P", palette=Image.Palette.ADAPTIVE, colors=256).save(image_buffer, "PNG")
+            return image_buffer.getvalue(), "png"
+        
+        return pix.tobytes("png"), "png"
+
     def _add_text_and_tables_to_slide(self, slide, text_dict: dict, page_num: int):
         """Add extracted text and tables to slide with proper formatting"""
         try:
@@ -210,16 +259,17 @@ class PDFToPowerPointConverter:
             
             for block in blocks:
                 if "lines" in block:
-                    # Process text blocks
-                    block_text = ""
+                    # Process text blocks; spans and lines are collected and
+                    # joined once rather than concatenated piece by piece
+                    block_lines = []
                     for line in block["lines"]:
-                        line_text = ""
-                        for span in line.get("spans", []):
-                            line_text += span.get("text", "")
-                        if line_text.strip():
-                            block_text += line_text + "\n"
+                        line_text = "".join([span.get("text", "") for span in line.get("spans", [])])
+                        # isspace() tests in place instead of building a stripped copy
+                        if line_text and not line_text.isspace():
+                            block_lines.append(line_text)
                     
-                    if block_text.strip():
+                    if block_lines:
+                        block_text = "\n".join(block_lines) + "\n"
                         # Check if this looks like a table (multiple columns with aligned text)
                         if self._is_table_like(block_text):
                             table_data.append(block_text)
@@ -241,11 +291,14 @@ class PDFToPowerPointConverter:
         if len(lines) < 2:
             return False
         
-        # Check for consistent spacing/tabs that indicate columns
-        tab_count = text.count('\t')
-        space_patterns = [len(re.findall(r'\s{2,}', line)) for line in lines]
+        # Tabs alone mark columns, so only count space runs when there are none
+        if '\t' in text:
+            return True
+        
+        # Check for consistent spacing that indicates columns
+        space_patterns = [len(COLUMN_GAP_PATTERN.findall(line)) for line in lines]
         
-        return tab_count > 0 or (len(set(space_patterns)) <= 2 and max(space_patterns) > 0)
+        return len(set(space_patterns)) <= 2 and max(space_patterns) > 0
 
     def _add_text_box_to_slide(self, slide, text: str, y_offset: float):
         """Add text box to slide with proper formatting"""
@@ -279,7 +332,7 @@ class PDFToPowerPointConverter:
                     if '\t' in row:
                         cols = row.split('\t')
                     else:
-                        cols = re.split(r'\s{2,}', row)
+                        cols = COLUMN_GAP_PATTERN.split(row)
                     if len(cols) > 1:
                         all_rows.append([col.strip() for col in cols])
             
@@ -298,11 +351,11 @@ class PDFToPowerPointConverter:
             )
             table = table_shape.table
             
-            # Fill table data
-            for i, row_data in enumerate(all_rows[:rows_count]):
-                for j, cell_data in enumerate(row_data[:max_cols]):
-                    if j < len(row_data):
-                        table.cell(i, j).text = str(cell_data)[:50]  # Limit cell text
+            # Fill table data, walking each row's cells once; table.cell(i, j)
+            # looks the row and cell elements up again on every call
+            for row_data, row in zip(all_rows[:rows_count], table.rows):
+                for cell_data, cell in zip(row_data, row.cells):
+                    cell.text = str(cell_data)[:50]  # Limit cell text
                         
         except Exception as e:
             print(f"Error adding table to slide: {e}")
@@ -310,20 +363,21 @@ class PDFToPowerPointConverter:
     def _convert_with_advanced_method(self, pdf_path: str, output_path: str) -> bool:
         """Enhanced advanced conversion combining text extraction with image conversion"""
         try:
-            if not (pdfplumber and convert_from_path and Presentation):
+            if not (pdfplumber and (fitz or convert_from_path) and Presentation):
                 return False
             
             # Create presentation
             prs = Presentation()
             
-            # Convert PDF pages to images for background
-            try:
-                images = convert_from_path(pdf_path, dpi=200, fmt='PNG')
-            except Exception as e:
-                print(f"Failed to convert PDF to images: {e}")
-                return False
-            
             with pdfplumber.open(pdf_path) as pdf:
+                # Render PDF pages to images for background, a few pages at a time;
+                # pdfplumber already has the page count, so pdf2image needn't ask pdfinfo
+                try:
+                    images = self._iter_page_images(pdf_path, dpi=200, page_count=len(pdf.pages), fmt='PNG')
+                except Exception as e:
+                    print(f"Failed to convert PDF to images: {e}")
+                    return False
+                
                 for page_num, (page, page_image) in enumerate(zip(pdf.pages, images)):
                     print(f"Processing page {page_num + 1} with advanced method")
                     
@@ -333,15 +387,15 @@ class PDFToPowerPointConverter:
                     
                     # Enhance and save page image
                     enhanced_image = self._enhance_image(page_image)
-                    temp_image_path = os.path.join(self.temp_dir, f"enhanced_page_{page_num}.png")
-                    enhanced_image.save(temp_image_path, 'PNG', quality=95, optimize=True)
+                    image_buffer = self._encode_page_image(enhanced_image)
                     
                     # Add background image
                     slide.shapes.add_picture(
-                        temp_image_path, 
-                        Inches(0), Inches(0), 
-                        Inches(10), Inches(7.5)
+                        image_buffer, 
+                        SLIDE_ORIGIN, SLIDE_ORIGIN, 
+                        SLIDE_WIDTH, SLIDE_HEIGHT
                     )
+                    page_image.close()
                     
                     # Extract and add tables
                     tables = page.extract_tables()
@@ -352,12 +406,6 @@ class PDFToPowerPointConverter:
                     text_elements = page.extract_text_lines()
                     if text_elements:
                         self._add_structured_text_to_slide(slide, text_elements, page_num)
-                    
-                    # Clean up temp image
-                    try:
-                        os.remove(temp_image_path)
-                    except:
-                        pass
             
             # Save presentation
             prs.save(output_path)
@@ -367,6 +415,85 @@ class PDFToPowerPointConverter:
             print(f"Advanced conversion method failed: {e}")
             return False
 
+    def _iter_page_images(self, pdf_path: str, dpi: int, batch_size: int = 4,
+                          page_count: Optional[int] = None,
+                          target_width: Optional[int] = None, **kwargs):
+        """Render pages to PIL images lazily instead of all at once.
+
+        PyMuPDF renders in-process, straight from the pixmap samples. Without
+        it, pdf2image renders batch_size pages per pdftoppm call, so only a
+        batch is held in memory at a time. The document is opened (or pdfinfo
+        queried) up front, so a bad file or missing poppler install usually
+        fails here rather than partway through the slides. Pass page_count when
+        the caller already knows it to skip the pdfinfo call, and target_width
+        to render pages straight at the pixel width they will be shown at
+        instead of at dpi.
+        """
+        if fitz and Image:
+            pdf_doc = fitz.open(pdf_path)
+            matrix = fitz.Matrix(dpi / 72, dpi / 72)
+            
+            def rendered_pages():
+                try:
+                    for page in pdf_doc:
+                        page_matrix = matrix
+                        if target_width:
+                            zoom = target_width / page.rect.width
+                            page_matrix = fitz.Matrix(zoom, zoom)
+                        pix = page.get_pixmap(matrix=page_matrix, alpha=False)
+                        # samples_mv is a view of the pixmap's buffer, so frombytes
+                        # makes the only copy (pix.samples would copy it first), and
+                        # the pixmap is freed before the caller works on the page
+                        image = Image.frombytes("RGB", (pix.width, pix.height), pix.samples_mv)
+                        del pix
+                        yield image
+                finally:
+                    pdf_doc.close()
+            
+            return rendered_pages()
+        
+        if page_count is None:
+            page_count = pdfinfo_from_path(pdf_path)["Pages"]
+        if target_width:
+            kwargs["size"] = (target_width, None)
+        
+        def render_batch(first_page):
+            last_page = min(first_page + batch_size - 1, page_count)
+            return convert_from_path(
+                pdf_path, dpi=dpi, first_page=first_page, last_page=last_page, **kwargs
+            )
+        
+        def page_images():
+            # pdftoppm runs as a subprocess, so render the next batch in the
+            # background while the caller builds slides from the current one
+            batch_starts = list(range(1, page_count + 1, batch_size))
+            if not batch_starts:
+                return
+            
+            with ThreadPoolExecutor(max_workers=1) as prefetch:
+                pending = prefetch.submit(render_batch, batch_starts[0])
+                for next_start in batch_starts[1:] + [None]:
+                    batch = pending.result()
+                    pending = prefetch.submit(render_batch, next_start) if next_start else None
+                    yield from batch
+        
+        return page_images()
+
+    def _encode_page_image(self, image) -> io.BytesIO:
+        """Encode a full-page render for embedding in a slide.
+
+        Pages with at most 256 distinct colors (flat diagrams, forms, slides
+        without anti-aliased text) are stored as lossless 8-bit palette PNGs;
+        everything else is stored as JPEG.
+        """
+        image_buffer = io.BytesIO()
+        if image.getcolors(256):
+            image.convert("P", palette=Image.Palette.ADAPTIVE, colors=256).save(image_buffer, "PNG")
+        else:
+            image.save(image_buffer, 'JPEG', quality=PAGE_IMAGE_JPEG_QUALITY)
+        image_buffer.seek(0)
+        return image_buffer
+
     def _enhance_image(self, image):
         """Enhance image quality for better presentation"""
         try:
@@ -414,19 +541,18 @@ class PDFToPowerPointConverter:
                 )
                 ppt_table = table_shape.table
                 
-                # Fill table data
-                for i, row_data in enumerate(filtered_table[:rows_count]):
-                    for j in range(max_cols):
+                # Fill table data, walking each row's cells once
+                for row_data, row in zip(filtered_table[:rows_count], ppt_table.rows):
+                    for j, cell in enumerate(row.cells):
                         cell_text = ""
                         if j < len(row_data) and row_data[j]:
                             cell_text = str(row_data[j])[:100]  # Limit cell text
                         
-                        cell = ppt_table.cell(i, j)
                         cell.text = cell_text
                         
                         # Format cell
                         for paragraph in cell.text_frame.paragraphs:
-                            paragraph.font.size = Pt(9)
+                            paragraph.font.size = TABLE_CELL_FONT_SIZE
                             paragraph.font.name = 'Arial'
                             
         except Exception as e:
@@ -453,9 +579,9 @@ class PDFToPowerPointConverter:
                 
                 # Format text
                 for paragraph in text_frame.paragraphs:
-                    paragraph.font.size = Pt(10)
+                    paragraph.font.size = STRUCTURED_TEXT_FONT_SIZE
                     paragraph.font.name = 'Arial'
-                    paragraph.font.color.rgb = RGBColor(50, 50, 50)
+                    paragraph.font.color.rgb = STRUCTURED_TEXT_COLOR
                     
         except Exception as e:
             print(f"Error adding structured text: {e}")
@@ -464,16 +590,19 @@ class PDFToPowerPointConverter:
         """Group text elements by proximity for better organization"""
         grouped = []
         current_group = []
+        group_length = -1  # length of ' '.join(current_group), kept as we go
         
         for element in text_elements:
             text = element.get('text', '').strip()
             if text:
                 current_group.append(text)
+                group_length += len(text) + 1
                 
                 # Start new group if we have enough text or hit certain patterns
-                if len(' '.join(current_group)) > 200 or text.endswith(('.', '!', '?', ':')):
+                if group_length > 200 or text.endswith(('.', '!', '?', ':')):
                     grouped.append(' '.join(current_group))
                     current_group = []
+                    group_length = -1
         
         # Add remaining text
         if current_group:
@@ -484,11 +613,13 @@ class PDFToPowerPointConverter:
     def _convert_with_enhanced_image_method(self, pdf_path: str, output_path: str) -> bool:
         """Enhanced image-based conversion with better quality"""
         try:
-            if not (convert_from_path and Presentation):
+            if not ((fitz or convert_from_path) and Presentation):
                 return False
             
-            # Convert PDF pages to high-quality images
-            images = convert_from_path(pdf_path, dpi=300, fmt='PNG')
+            # Render PDF pages to high-quality images, a few pages at a time. Slides
+            # are 1920px wide, so render at that width rather than at 300 DPI and
+            # scaling the larger image down afterwards
+            images = self._iter_page_images(pdf_path, dpi=300, target_width=1920, fmt='PNG')
             
             # Create presentation
             prs = Presentation()
@@ -508,21 +639,15 @@ class PDFToPowerPointConverter:
                 enhanced_image = enhanced_image.resize((slide_width, slide_height), Image.Resampling.LANCZOS)
                 
                 # Save enhanced image
-                temp_image_path = os.path.join(self.temp_dir, f"enhanced_slide_{page_num}.png")
-                enhanced_image.save(temp_image_path, 'PNG', quality=95, optimize=True)
+                image_buffer = self._encode_page_image(enhanced_image)
                 
                 # Add image to slide
                 slide.shapes.add_picture(
-                    temp_image_path, 
-                    Inches(0), Inches(0), 
-                    Inches(10), Inches(7.5)
+                    image_buffer, 
+                    SLIDE_ORIGIN, SLIDE_ORIGIN, 
+                    SLIDE_WIDTH, SLIDE_HEIGHT
                 )
-                
-                # Clean up temp image
-                try:
-                    os.remove(temp_image_path)
-                except:
-                    pass
+                image.close()
             
             # Save presentation
             prs.save(output_path)
@@ -585,9 +710,9 @@ class PDFToPowerPointConverter:
                             
                             # Enhanced text formatting
                             for paragraph in content.text_frame.paragraphs:
-                                paragraph.font.size = Pt(12)
+                                paragraph.font.size = BODY_TEXT_FONT_SIZE
                                 paragraph.font.name = 'Arial'
-                                paragraph.space_after = Pt(6)
+                                paragraph.space_after = BODY_TEXT_SPACE_AFTER
                         else:
                             # Add placeholder text
                             content = slide.placeholders[1]
@@ -605,22 +730,21 @@ class PDFToPowerPointConverter:
         """Process and clean extracted text for better readability"""
         try:
             # Clean up excessive whitespace
-            text = re.sub(r'\n\s*\n', '\n\n', text)
-            text = re.sub(r'[ \t]+', ' ', text)
+            text = BLANK_LINES_PATTERN.sub('\n\n', text)
+            text = INLINE_SPACE_PATTERN.sub(' ', text)
             
             # Add bullet points for lists
             lines = text.split('\n')
             processed_lines = []
             
-            for line in lines:
-                line = line.strip()
+            for line in map(str.strip, lines):
                 if line:
-                    # Detect if line might be a list item
-                    if (line.startswith(('•', '-', '*', '1.', '2.', '3.', '4.', '5.')) or
-                        re.match(r'^\d+[\.\)]\s', line) or
-                        (len(line) < 100 and not line.endswith(('.', '!', '?')))):
-                        if not line.startswith('•'):
-                            line = '• ' + line
+                    # Detect if line might be a list item; lines that already
+                    # start with a bullet are kept as they are
+                    if line[0] != '•' and (
+                        (len(line) < 100 and not line.endswith(('.', '!', '?'))) or
+                        LIST_ITEM_PATTERN.match(line)):
+                        line = '• ' + line
                     processed_lines.append(line)
             
             return '\n'.join(processed_lines)
@@ -4,21 +4,28 @@ Advanced PDF to Word converter with formatting preservation
 """
 
 import os
-import json
+import sys
+import math
+import mmap
+import pickle
+import hashlib
+import importlib.util
+import shutil
+import zipfile
 import tempfile
+import threading
 import traceback
-from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, Optional, Tuple
-import uuid
+from typing import Dict, Any
+from concurrent.futures import ProcessPoolExecutor
 
-try:
-    from pdf2docx import Converter, parse
-    print("pdf2docx successfully imported")
-except ImportError as e:
-    print(f"Warning: pdf2docx not available - {e}")
-    Converter = None
-    parse = None
+# pdf2docx pulls in OpenCV and NumPy, which the fallback path never needs, so
+# only check that it is installed here; it is imported on first use
+PDF2DOCX_AVAILABLE = importlib.util.find_spec("pdf2docx") is not None
+if PDF2DOCX_AVAILABLE:
+    print("pdf2docx available")
+else:
+    print("Warning: pdf2docx not available")
 
 try:
     import PyPDF2
@@ -29,38 +36,260 @@ except ImportError:
 
 try:
     from docx import Document
-    from docx.shared import Inches, Pt
-    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    from docx.enum.text import WD_BREAK
+    from docx.oxml import OxmlElement
+    from docx.text.paragraph import Paragraph
 except ImportError:
     print("Warning: python-docx not available")
     Document = None
 
+try:
+    from lxml import etree
+    # Part of the docx package holding the title/author/comments properties
+    CORE_PROPERTIES_PART = "docProps/core.xml"
+    DC_NAMESPACE = "http://purl.org/dc/elements/1.1/"
+except ImportError:
+    print("Warning: lxml not available")
+    etree = None
+
 try:
     import pdfplumber
 except ImportError:
     print("Warning: pdfplumber not available")
     pdfplumber = None
 
-try:
-    from PIL import Image
-except ImportError:
-    print("Warning: Pillow not available")
-    Image = None
+# Per-process handle opened by _init_page_worker, so each worker parses the
+# PDF's xref table once rather than once per page
+_WORKER_PDF = None
+
+def _init_page_worker(pdf_path: str):
+    """ProcessPoolExecutor initializer: open the PDF once for this worker"""
+    global _WORKER_PDF
+    _WORKER_PDF = pdfplumber.open(pdf_path)
+
+def _extract_worker_page(page_num: int) -> Dict[str, Any]:
+    """Extract one page from the worker's already open PDF"""
+    page = _WORKER_PDF.pages[page_num]
+    try:
+        return _extract_page_content(page)
+    finally:
+        # Drop the page's parsed objects; the worker keeps the document open
+        page.close()
+
+def _extract_page_content(page) -> Dict[str, Any]:
+    """Extract text, tables and image count from a single pdfplumber page.
+
+    Runs in worker processes, so it only returns plain picklable data.
+    Tables are found once; their cells are extracted from that result and
+    characters inside a table are left out of the text so they aren't
+    written to the document twice.
+    """
+    found_tables = page.find_tables()
+    table_bboxes = [table.bbox for table in found_tables]
+    
+    def outside_tables(obj):
+        if obj.get("object_type") != "char":
+            return True
+        for x0, top, x1, bottom in table_bboxes:
+            if obj["x0"] < x1 and obj["x1"] > x0 and obj["top"] < bottom and obj["bottom"] > top:
+                return False
+        return True
+    
+    text_page = page.filter(outside_tables) if table_bboxes else page
+    return {
+        "text": text_page.extract_text(layout=True, x_tolerance=3, y_tolerance=3),
+        "tables": [table.extract() for table in found_tables],
+        "image_count": len(page.images) if hasattr(page, 'images') else 0
+    }
+
+# Results of previous conversions keyed by the PDF's SHA-256, so re-uploads of
+# the same file skip metadata/table scanning and per-page extraction.
+# Each PDF's results are pickled to PDF_CACHE_DIR/<sha[:2]>/<sha>.pkl, which all
+# conversion worker processes share and which survives a rebuilt pool; the least
+# recently used files are deleted once the directory passes
+# PDF_DISK_CACHE_MAX_BYTES. _PDF_CACHE keeps the documents this process used
+# last in memory, up to PDF_CACHE_MAX_BYTES. In the server each worker runs one
+# conversion at a time; _PDF_CACHE_LOCK is for callers that share a converter
+# between threads.
+PDF_CACHE_DIR = Path(tempfile.gettempdir()) / "buzzy_pdf_cache"
+PDF_DISK_CACHE_MAX_BYTES = 256 * 1024 * 1024
+PDF_CACHE_MAX_BYTES = 32 * 1024 * 1024
+_PDF_CACHE = {}
+# Approximate memory held by each document in _PDF_CACHE
+_PDF_CACHE_SIZES = {}
+_pdf_cache_bytes = 0
+_PDF_CACHE_LOCK = threading.Lock()
+
+def _pdf_sha256(pdf_path: str) -> str:
+    """Hash the PDF's bytes through an mmap instead of reading them into memory"""
+    with open(pdf_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return hashlib.sha256().hexdigest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return hashlib.sha256(mapped).hexdigest()
+
+def _result_size(value) -> int:
+    """Approximate memory held by a cached result, in bytes"""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_result_size(item) for item in value.values())
+    elif isinstance(value, (list, tuple)):
+        size += sum(_result_size(item) for item in value)
+    return size
+
+def _remember_pdf_results(pdf_hash: str, entry: Dict[str, Any]):
+    """Keep a PDF's results in _PDF_CACHE as the most recently used document,
+    evicting the oldest ones while it is over PDF_CACHE_MAX_BYTES. The caller
+    holds _PDF_CACHE_LOCK."""
+    global _pdf_cache_bytes
+    _PDF_CACHE.pop(pdf_hash, None)
+    _pdf_cache_bytes -= _PDF_CACHE_SIZES.pop(pdf_hash, 0)
+    _PDF_CACHE[pdf_hash] = entry
+    _PDF_CACHE_SIZES[pdf_hash] = _result_size(entry)
+    _pdf_cache_bytes += _PDF_CACHE_SIZES[pdf_hash]
+    while _pdf_cache_bytes > PDF_CACHE_MAX_BYTES and _PDF_CACHE:
+        oldest = next(iter(_PDF_CACHE))
+        del _PDF_CACHE[oldest]
+        _pdf_cache_bytes -= _PDF_CACHE_SIZES.pop(oldest)
+
+def _pdf_cache_file(pdf_hash: str) -> Path:
+    return PDF_CACHE_DIR / pdf_hash[:2] / f"{pdf_hash}.pkl"
+
+def _pdf_cache_dir_is_private() -> bool:
+    """Create PDF_CACHE_DIR if needed and check that only this user can write to it,
+    since the files in it are unpickled"""
+    try:
+        PDF_CACHE_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+        stat = PDF_CACHE_DIR.stat()
+    except OSError as e:
+        print(f"PDF cache directory unavailable: {e}")
+        return False
+    if stat.st_uid != os.getuid() or stat.st_mode & 0o022:
+        print(f"Warning: not using {PDF_CACHE_DIR}, it is writable by other users")
+        return False
+    return True
+
+def _load_pdf_results(pdf_hash: str) -> Dict[str, Any]:
+    """Read a PDF's results from the disk cache (empty if there are none)"""
+    if not _pdf_cache_dir_is_private():
+        return {}
+    cache_file = _pdf_cache_file(pdf_hash)
+    try:
+        with open(cache_file, 'rb') as f:
+            entry = pickle.load(f)
+        # Pruning removes the least recently used files first
+        os.utime(cache_file)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        print(f"Ignoring unreadable PDF cache file {cache_file}: {e}")
+        return {}
+    return entry if isinstance(entry, dict) else {}
+
+def _save_pdf_results(pdf_hash: str, entry: Dict[str, Any]):
+    """Write a PDF's results to the disk cache through a temp file and os.replace,
+    so other processes never read a partly written file"""
+    if not _pdf_cache_dir_is_private():
+        return
+    cache_file = _pdf_cache_file(pdf_hash)
+    try:
+        cache_file.parent.mkdir(mode=0o700, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=cache_file.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, cache_file)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+    except Exception as e:
+        print(f"Could not write PDF cache file {cache_file}: {e}")
+        return
+    _prune_pdf_cache_dir()
+
+def _prune_pdf_cache_dir():
+    """Delete the least recently used cache files while PDF_CACHE_DIR is over PDF_DISK_CACHE_MAX_BYTES"""
+    cache_files = []
+    total = 0
+    try:
+        with os.scandir(PDF_CACHE_DIR) as subdirs:
+            for subdir in subdirs:
+                if not subdir.is_dir():
+                    continue
+                with os.scandir(subdir.path) as entries:
+                    for entry in entries:
+                        try:
+                            stat = entry.stat()
+                        except OSError:
+                            continue
+                        cache_files.append((stat.st_mtime, stat.st_size, entry.path))
+                        total += stat.st_size
+    except OSError as e:
+        print(f"Could not scan PDF cache directory: {e}")
+        return
+    
+    for _, file_size, path in sorted(cache_files):
+        if total <= PDF_DISK_CACHE_MAX_BYTES:
+            break
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+        total -= file_size
+
+def _cached_pdf_results(pdf_hash: str) -> Dict[str, Any]:
+    """Return a copy of the results cached for a PDF (empty if there are none),
+    looking in memory first and then on disk"""
+    with _PDF_CACHE_LOCK:
+        if pdf_hash in _PDF_CACHE:
+            _PDF_CACHE[pdf_hash] = _PDF_CACHE.pop(pdf_hash)
+            return dict(_PDF_CACHE[pdf_hash])
+    entry = _load_pdf_results(pdf_hash)
+    if entry:
+        with _PDF_CACHE_LOCK:
+            _remember_pdf_results(pdf_hash, entry)
+    return dict(entry)
+
+def _drop_pdf_results(pdf_hash: str):
+    """Forget everything cached for a PDF, in memory and on disk"""
+    global _pdf_cache_bytes
+    with _PDF_CACHE_LOCK:
+        _PDF_CACHE.pop(pdf_hash, None)
+        _pdf_cache_bytes -= _PDF_CACHE_SIZES.pop(pdf_hash, 0)
+    try:
+        os.unlink(_pdf_cache_file(pdf_hash))
+    except OSError:
+        pass
+
+def _cache_pdf_result(pdf_hash: str, key: str, value):
+    """Store one result for a PDF in memory and on disk"""
+    with _PDF_CACHE_LOCK:
+        entry = _PDF_CACHE.get(pdf_hash)
+    if entry is None:
+        entry = _load_pdf_results(pdf_hash)
+    entry = dict(entry)
+    entry[key] = value
+    with _PDF_CACHE_LOCK:
+        _remember_pdf_results(pdf_hash, entry)
+    _save_pdf_results(pdf_hash, entry)
 
 class PDFToWordConverter:
     """Advanced PDF to Word converter with formatting preservation"""
     
-    def __init__(self, output_dir: str = None):
+    def __init__(self, output_dir: str = None, page_workers: int = None):
         self.output_dir = output_dir or tempfile.mkdtemp()
         Path(self.output_dir).mkdir(parents=True, exist_ok=True)
+        # Upper bound on the processes one conversion spreads its pages across
+        self.page_workers = page_workers or os.cpu_count() or 1
         
-    def convert_pdf_to_word(self, pdf_path: str, output_filename: str = None) -> Dict[str, Any]:
+    def convert_pdf_to_word(self, pdf_path: str, output_filename: str = None, force_refresh: bool = False) -> Dict[str, Any]:
         """
         Convert PDF to Word with advanced formatting preservation
         
         Args:
             pdf_path: Path to the input PDF file
             output_filename: Desired output filename (optional)
+            force_refresh: Ignore results cached from an earlier conversion of the same file
             
         Returns:
             Dictionary with conversion results and metadata
@@ -82,38 +311,64 @@ class PDFToWordConverter:
                 
             output_path = os.path.join(self.output_dir, output_filename)
             
-            # Get PDF metadata
-            metadata = self._get_pdf_metadata(pdf_path)
-            
-            # Attempt advanced conversion with pdf2docx
-            if Converter:
-                success = self._convert_with_pdf2docx(pdf_path, output_path)
-                if success:
-                    # Enhance the converted document
-                    self._enhance_document(output_path, metadata)
-                    return {
-                        "success": True,
-                        "output_path": output_path,
-                        "filename": output_filename,
-                        "method": "pdf2docx_advanced",
-                        "metadata": metadata,
-                        "file_size": os.path.getsize(output_path)
-                    }
+            pdf_hash = _pdf_sha256(pdf_path)
+            if force_refresh:
+                _drop_pdf_results(pdf_hash)
+            cached = _cached_pdf_results(pdf_hash)
             
-            # Fallback to manual conversion
-            if pdfplumber and Document:
-                success = self._convert_with_fallback(pdf_path, output_path)
-                if success:
-                    return {
-                        "success": True,
-                        "output_path": output_path,
-                        "filename": output_filename,
-                        "method": "pdfplumber_fallback",
-                        "metadata": metadata,
-                        "file_size": os.path.getsize(output_path)
-                    }
+            # Open the PDF once with pdfplumber; metadata and the post-conversion
+            # content scan share the parsed document and page list.
+            # A file converted before already has its scanned metadata cached.
+            pdf = None
+            if pdfplumber and "metadata" not in cached:
+                try:
+                    pdf = pdfplumber.open(pdf_path)
+                except Exception as e:
+                    print(f"Error opening PDF with pdfplumber: {e}")
             
-            return {"success": False, "error": "No suitable conversion method available"}
+            try:
+                # Get PDF metadata; image/table flags are filled in by whichever method converts
+                if "metadata" in cached:
+                    metadata = dict(cached["metadata"])
+                else:
+                    metadata = self._get_pdf_metadata(pdf_path, pdf)
+                
+                # Attempt advanced conversion with pdf2docx
+                if PDF2DOCX_AVAILABLE:
+                    success = self._convert_with_pdf2docx(pdf_path, output_path)
+                    if success:
+                        # Enhance the converted document
+                        self._enhance_document(output_path, metadata)
+                        if "metadata" not in cached:
+                            self._scan_page_content(pdf, metadata)
+                            _cache_pdf_result(pdf_hash, "metadata", dict(metadata))
+                        return {
+                            "success": True,
+                            "output_path": output_path,
+                            "filename": output_filename,
+                            "method": "pdf2docx_advanced",
+                            "metadata": metadata,
+                            "file_size": os.path.getsize(output_path)
+                        }
+                
+                # Fallback to manual conversion
+                if pdfplumber and Document:
+                    success = self._convert_with_fallback(pdf_path, output_path, metadata, pdf_hash, pdf)
+                    if success:
+                        _cache_pdf_result(pdf_hash, "metadata", dict(metadata))
+                        return {
+                            "success": True,
+                            "output_path": output_path,
+                            "filename": output_filename,
+                            "method": "pdfplumber_fallback",
+                            "metadata": metadata,
+                            "file_size": os.path.getsize(output_path)
+                        }
+                
+                return {"success": False, "error": "No suitable conversion method available"}
+            finally:
+                if pdf is not None:
+                    pdf.close()
             
         except Exception as e:
             error_msg = f"Conversion failed: {str(e)}"
@@ -123,6 +378,12 @@ class PDFToWordConverter:
     
     def _convert_with_pdf2docx(self, pdf_path: str, output_path: str) -> bool:
         """Convert using pdf2docx library (most advanced)"""
+        try:
+            from pdf2docx import Converter, parse
+        except ImportError as e:
+            print(f"Warning: pdf2docx could not be imported - {e}")
+            return False
+        
         try:
             # Use pdf2docx's parse function for better control
             parse(
@@ -131,8 +392,7 @@ class PDFToWordConverter:
                 start=0,  # Start from first page
                 end=None,  # Convert all pages
                 pages=None,  # Convert all pages
-                password=None,  # No password
-                debug=True
+                password=None  # No password
             )
             return True
         except Exception as e:
@@ -147,47 +407,114 @@ class PDFToWordConverter:
                 print(f"Alternative pdf2docx method also failed: {e2}")
                 return False
     
-    def _convert_with_fallback(self, pdf_path: str, output_path: str) -> bool:
-        """Fallback conversion using pdfplumber + python-docx"""
+    def _convert_with_fallback(self, pdf_path: str, output_path: str, metadata: Dict[str, Any], pdf_hash: str = None, pdf=None) -> bool:
+        """Fallback conversion using pdfplumber + python-docx.
+
+        Text, tables and images are read in one pass per page, which also
+        fills in the has_images/has_tables metadata flags. The extracted
+        pages are cached under pdf_hash and reused for the same file. pdf is
+        the caller's already open pdfplumber document, if it has one.
+        """
         try:
             doc = Document()
             
-            with pdfplumber.open(pdf_path) as pdf:
-                for page_num, page in enumerate(pdf.pages):
+            cached_pages = _cached_pdf_results(pdf_hash).get("page_contents") if pdf_hash else None
+            page_count = metadata.get("pages", 0)
+            if cached_pages is not None:
+                page_count = len(cached_pages)
+            elif pdf is not None:
+                page_count = len(pdf.pages)
+            elif not page_count:
+                with pdfplumber.open(pdf_path) as page_count_pdf:
+                    page_count = len(page_count_pdf.pages)
+            
+            # pdfplumber extraction is pure Python, so spread pages across processes;
+            # python-docx is not process-safe, so the document is assembled here in order.
+            # executor.map yields pages as they complete, so assembly overlaps extraction.
+            # Each worker opens the PDF once in its initializer and then only
+            # receives page numbers.
+            executor = None
+            if cached_pages is not None:
+                page_contents = cached_pages
+            elif min(self.page_workers, page_count) > 1:
+                # One run of adjacent pages per worker, so each worker's pdfminer
+                # font/resource cache keeps getting hits
+                chunksize = math.ceil(page_count / min(self.page_workers, page_count))
+                executor = ProcessPoolExecutor(
+                    max_workers=math.ceil(page_count / chunksize),
+                    initializer=_init_page_worker,
+                    initargs=(pdf_path,)
+                )
+                page_contents = executor.map(_extract_worker_page, range(page_count), chunksize=chunksize)
+            elif pdf is not None:
+                page_contents = [_extract_page_content(page) for page in pdf.pages]
+            else:
+                with pdfplumber.open(pdf_path) as single_page_pdf:
+                    page_contents = [_extract_page_content(page) for page in single_page_pdf.pages]
+            
+            # Last block written, if it was a paragraph; page breaks go into it
+            last_paragraph = None
+            extracted_pages = []
+            
+            # Paragraphs are inserted directly in front of the trailing w:sectPr.
+            # doc.add_paragraph() searches the body for it on every call, which is
+            # quadratic over a long document. sectPr stays in place because
+            # doc.add_table() reads the page width from the last section
+            sect_pr = doc.element.body.sectPr
+            style_ids = {name: doc.styles[name].style_id for name in ('Heading 2', 'Heading 3', 'Intense Quote')}
+            
+            try:
+                for page_num, content in enumerate(page_contents):
+                    extracted_pages.append(content)
                     if page_num > 0:
-                        # Add page break between pages
-                        doc.add_page_break()
+                        # Add page break between pages, as a run on the previous
+                        # paragraph rather than a paragraph of its own
+                        if last_paragraph is not None:
+                            last_paragraph.add_run().add_break(WD_BREAK.PAGE)
+                        else:
+                            last_paragraph = doc.add_page_break()
                     
                     # Add page header
                     if page_num == 0:
-                        header_para = doc.add_paragraph(f"Converted from PDF - Page {page_num + 1}")
-                        header_para.style = 'Heading 3'
+                        last_paragraph = self._append_paragraph(doc, f"Converted from PDF - Page {page_num + 1}", style_ids['Heading 3'], sect_pr)
                     
-                    # Extract text with better formatting
-                    text = page.extract_text(layout=True, x_tolerance=3, y_tolerance=3)
-                    if text and text.strip():
+                    # Add text with better formatting
+                    text = content["text"]
+                    if text and not text.isspace():
                         # Split text into paragraphs and add them
                         paragraphs = text.split('\n\n')
                         for para_text in paragraphs:
-                            if para_text.strip():
-                                para = doc.add_paragraph(para_text.strip())
-                                # Basic formatting based on text characteristics
-                                if len(para_text.strip()) < 100 and para_text.strip().isupper():
-                                    para.style = 'Heading 2'
-                                elif para_text.strip().endswith(':'):
-                                    para.style = 'Heading 3'
+                            para_text = para_text.strip()
+                            if para_text:
+                                # Basic formatting based on text characteristics, applied
+                                # when the paragraph is created rather than restyled after
+                                if len(para_text) < 100 and para_text.isupper():
+                                    style_id = style_ids['Heading 2']
+                                elif para_text.endswith(':'):
+                                    style_id = style_ids['Heading 3']
+                                else:
+                                    style_id = None
+                                last_paragraph = self._append_paragraph(doc, para_text, style_id, sect_pr)
                     
-                    # Extract and add tables with better formatting
-                    tables = page.extract_tables()
+                    # Add tables with better formatting
+                    tables = content["tables"]
                     if tables:
+                        metadata["has_tables"] = True
                         for table_data in tables:
                             if table_data:
                                 self._add_table_to_doc(doc, table_data)
+                                last_paragraph = None
                     
                     # Handle images better
-                    if hasattr(page, 'images') and page.images:
-                        img_para = doc.add_paragraph(f"\n[Note: {len(page.images)} image(s) found on page {page_num + 1} - Image extraction requires advanced processing]\n")
-                        img_para.style = 'Intense Quote'
+                    if content["image_count"]:
+                        metadata["has_images"] = True
+                        last_paragraph = self._append_paragraph(doc, f"\n[Note: {content['image_count']} image(s) found on page {page_num + 1} - Image extraction requires advanced processing]\n", style_ids['Intense Quote'], sect_pr)
+            finally:
+                if executor:
+                    executor.shutdown(cancel_futures=True)
+            
+            if pdf_hash and cached_pages is None:
+                _cache_pdf_result(pdf_hash, "page_contents", extracted_pages)
             
             # Add document properties
             doc.core_properties.title = "PDF Conversion Result"
@@ -201,6 +528,19 @@ class PDFToWordConverter:
             print(f"Fallback conversion failed: {e}")
             return False
     
+    def _append_paragraph(self, doc, text: str, style_id: str = None, sect_pr=None):
+        """Append a paragraph to the end of the document body without searching it.
+        Pass the body's sectPr so the paragraph goes in front of it"""
+        p = OxmlElement('w:p')
+        if style_id:
+            p.style = style_id
+        p.add_r().text = text
+        if sect_pr is not None:
+            sect_pr.addprevious(p)
+        else:
+            doc.element.body.append(p)
+        return Paragraph(p, doc)
+    
     def _add_table_to_doc(self, doc, table_data):
         """Add table to Word document with formatting"""
         if not table_data or not any(table_data):
@@ -219,17 +559,33 @@ class PDFToWordConverter:
         table = doc.add_table(rows=rows, cols=cols)
         table.style = 'Table Grid'
         
-        for i, row in enumerate(filtered_table):
-            for j, cell in enumerate(row):
-                if j < len(table.rows[i].cells):
-                    table.rows[i].cells[j].text = str(cell) if cell else ""
+        # Write runs straight into the new table's <w:tc> elements instead of
+        # going through Row/_Cell proxies and the cell.text setter. A fresh cell
+        # already holds one empty paragraph, so there is nothing to clear and
+        # empty cells can be skipped.
+        for row, tr in zip(filtered_table, table._tbl.tr_lst):
+            for cell, tc in zip(row, tr.tc_lst):
+                if cell:
+                    tc.p_lst[0].add_r().text = str(cell)
     
-    def _get_pdf_metadata(self, pdf_path: str) -> Dict[str, Any]:
-        """Extract metadata from PDF file"""
+    def _get_pdf_metadata(self, pdf_path: str, pdf=None) -> Dict[str, Any]:
+        """Extract metadata from PDF file, using the already open pdfplumber document if given"""
         metadata = {"pages": 0, "has_images": False, "has_tables": False}
         
         try:
-            if PyPDF2:
+            if pdf is not None:
+                metadata["pages"] = len(pdf.pages)
+                
+                # Get document info
+                if pdf.metadata:
+                    metadata.update({
+                        "title": pdf.metadata.get('Title', ''),
+                        "author": pdf.metadata.get('Author', ''),
+                        "subject": pdf.metadata.get('Subject', ''),
+                        "creator": pdf.metadata.get('Creator', '')
+                    })
+            
+            elif PyPDF2:
                 with open(pdf_path, 'rb') as file:
                     pdf_reader = PdfReader(file)
                     metadata["pages"] = len(pdf_reader.pages)
@@ -242,55 +598,92 @@ class PDFToWordConverter:
                             "subject": pdf_reader.metadata.get('/Subject', ''),
                             "creator": pdf_reader.metadata.get('/Creator', '')
                         })
-            
-            # Check for images and tables using pdfplumber
-            if pdfplumber:
-                with pdfplumber.open(pdf_path) as pdf:
-                    for page in pdf.pages:
-                        if hasattr(page, 'images') and page.images:
-                            metadata["has_images"] = True
-                        
-                        tables = page.extract_tables()
-                        if tables:
-                            metadata["has_tables"] = True
                             
         except Exception as e:
             print(f"Error extracting metadata: {e}")
             
         return metadata
     
+    def _scan_page_content(self, pdf, metadata: Dict[str, Any]):
+        """Set the has_images/has_tables flags, stopping once both are found"""
+        if pdf is None:
+            return
+        
+        try:
+            for page in pdf.pages:
+                if not metadata["has_images"] and hasattr(page, 'images') and page.images:
+                    metadata["has_images"] = True
+                
+                if not metadata["has_tables"] and page.find_tables():
+                    metadata["has_tables"] = True
+                
+                if metadata["has_images"] and metadata["has_tables"]:
+                    break
+                    
+        except Exception as e:
+            print(f"Error scanning page content: {e}")
+    
     def _enhance_document(self, doc_path: str, metadata: Dict[str, Any]):
-        """Enhance the converted document with additional formatting"""
+        """Enhance the converted document with additional formatting.
+
+        Only docProps/core.xml changes, so that part is patched in the zip and
+        every other part is copied across without being parsed by python-docx.
+        """
         try:
-            if not Document:
+            if not etree:
                 return
-                
-            doc = Document(doc_path)
             
-            # Add document properties
-            doc.core_properties.title = metadata.get("title", "Converted Document")
-            doc.core_properties.author = metadata.get("author", "PDF Converter")
-            doc.core_properties.comments = f"Converted from PDF - {metadata.get('pages', 0)} pages"
+            properties = {
+                "title": metadata.get("title", "Converted Document"),
+                "creator": metadata.get("author", "PDF Converter"),
+                "description": f"Converted from PDF - {metadata.get('pages', 0)} pages"
+            }
+            
+            temp_path = doc_path + ".tmp"
+            with zipfile.ZipFile(doc_path) as source:
+                try:
+                    core = etree.fromstring(source.read(CORE_PROPERTIES_PART))
+                except KeyError:
+                    # No core properties part to patch
+                    return
+                
+                # Add document properties
+                for name, value in properties.items():
+                    tag = f"{{{DC_NAMESPACE}}}{name}"
+                    element = core.find(tag)
+                    if element is None:
+                        element = etree.SubElement(core, tag)
+                    element.text = value
+                
+                with zipfile.ZipFile(temp_path, "w", zipfile.ZIP_DEFLATED) as target:
+                    for item in source.infolist():
+                        if item.filename == CORE_PROPERTIES_PART:
+                            target.writestr(item, etree.tostring(core, xml_declaration=True, encoding="UTF-8", standalone=True))
+                        else:
+                            with source.open(item) as src, target.open(item, "w") as dst:
+                                shutil.copyfileobj(src, dst)
             
-            # Save enhanced document
-            doc.save(doc_path)
+            os.replace(temp_path, doc_path)
             
         except Exception as e:
             print(f"Error enhancing document: {e}")
+            if os.path.exists(doc_path + ".tmp"):
+                os.remove(doc_path + ".tmp")
 
-def convert_pdf_file(pdf_path: str, output_dir: str = None) -> Dict[str, Any]:
+def convert_pdf_file(pdf_path: str, output_dir: str = None, force_refresh: bool = False) -> Dict[str, Any]:
     """
     Main function to convert PDF to Word
     
     Args:
         pdf_path: Path to PDF file
         output_dir: Directory to save converted file
+        force_refresh: Ignore results cached from an earlier conversion of the same file
         
     Returns:
         Conversion result dictionary
     """
     converter = PDFToWordConverter(output_dir)
-    return converter.convert_pdf_to_word(pdf_path)
+    return converter.convert_pdf_to_word(pdf_path, force_refresh=force_refresh)
 
 if __name__ == "__main__":
     # Test the converter
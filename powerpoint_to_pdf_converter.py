@@ -7,6 +7,7 @@ Uses multiple methods for optimal conversion quality with advanced formatting pr
 """
 
 import os
+import io
 import tempfile
 import traceback
 import shutil
@@ -42,6 +43,18 @@ try:
     from reportlab.lib import colors
     from reportlab.pdfgen import canvas
     print("reportlab successfully imported")
+
+    # Shared style for slide tables, built once instead of for every table
+    TABLE_STYLE = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ])
 except ImportError as e:
     print(f"Warning: reportlab not available - {e}")
     SimpleDocTemplate = None
@@ -265,21 +278,11 @@ class PowerPointToPDFConverter:
             image = shape.image
             image_bytes = image.blob
             
-            # Save image temporarily
-            temp_img_path = os.path.join(self.temp_dir, f"temp_img_{uuid.uuid4().hex}.png")
-            with open(temp_img_path, 'wb') as f:
-                f.write(image_bytes)
-            
-            # Add to story with size constraints
-            img = RLImage(temp_img_path, width=4*inch, height=3*inch)
+            # Add to story with size constraints; ReportLab reads the image
+            # again when the story is built, so hand it an in-memory buffer
+            img = RLImage(io.BytesIO(image_bytes), width=4*inch, height=3*inch)
             story.append(img)
             story.append(Spacer(1, 12))
-            
-            # Clean up temp image
-            try:
-                os.remove(temp_img_path)
-            except:
-                pass
                 
         except Exception as e:
             print(f"Error adding image: {e}")
@@ -301,16 +304,7 @@ class PowerPointToPDFConverter:
             if data:
                 # Create ReportLab table
                 pdf_table = Table(data)
-                pdf_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 10),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black)
-                ]))
+                pdf_table.setStyle(TABLE_STYLE)
                 
                 story.append(pdf_table)
                 story.append(Spacer(1, 12))